@@ -0,0 +1,128 @@
+"""
+Сравнение скорости алгоритмов построения отрезков на случайных отрезках.
+
+Работает без окна: алгоритмы берутся из line_algorithms и line_batch.
+Для каждого алгоритма печатается скорость (пикселей в секунду), время на
+один отрезок и пиковая память, выделенная за время построения.
+
+Примеры:
+    python benchmark.py
+    python benchmark.py --count 5000 --min-length 1 --max-length 20 --slope steep
+    python benchmark.py --algorithms Брезенхем "Брезенхем (NumPy)" --repeat 5
+"""
+import argparse
+import math
+import random
+import time
+import tracemalloc
+
+from line_algorithms import (double_step_iterations, generate_line_bresenham, generate_line_dda,
+                             generate_line_double_step, generate_line_wu, generate_line_wu_int)
+from line_batch import rasterize
+
+# Размер холста редактора: в его пределах выбираются начала отрезков
+AREA_WIDTH = 600
+AREA_HEIGHT = 400
+
+# Диапазоны угла наклона (в градусах от оси x)
+SLOPES = {
+    "any": (0, 360),
+    "shallow": (0, 45),  # Главная ось — x
+    "steep": (45, 90),  # Главная ось — y
+    "diagonal": (45, 45),
+    "axis": (0, 0),
+}
+
+
+def random_segments(count, min_length=1, max_length=700, slope="any", seed=0):
+    """Случайные отрезки заданной длины и наклона с началом в пределах холста."""
+    rng = random.Random(seed)
+    lo, hi = SLOPES[slope]
+    segments = []
+    for _ in range(count):
+        x1 = rng.randrange(AREA_WIDTH)
+        y1 = rng.randrange(AREA_HEIGHT)
+        length = rng.uniform(min_length, max_length)
+        angle = math.radians(rng.uniform(lo, hi))
+        if slope != "any":
+            # Для заданного наклона направление по каждой оси выбирается случайно
+            angle = rng.choice((angle, math.pi - angle, math.pi + angle, -angle))
+        segments.append((x1, y1, x1 + round(length * math.cos(angle)), y1 + round(length * math.sin(angle))))
+    return segments
+
+
+def _per_segment(generate):
+    """Обёртка для алгоритма, строящего один отрезок: возвращает общее число пикселей."""
+    return lambda segments: sum(len(generate(*seg)) for seg in segments)
+
+
+def _batch(algorithm):
+    """Обёртка для пакетной растеризации всех отрезков сразу."""
+    return lambda segments: len(rasterize(segments, algorithm).x)
+
+
+ALGORITHMS = {
+    "ЦДА": _per_segment(generate_line_dda),
+    "Брезенхем": _per_segment(generate_line_bresenham),
+    "Ву": _per_segment(generate_line_wu),
+    "Двойной шаг": _per_segment(generate_line_double_step),
+    "Ву (целочисленный)": _per_segment(generate_line_wu_int),
+    "ЦДА (NumPy)": _batch("ЦДА"),
+    "Брезенхем (NumPy)": _batch("Брезенхем"),
+    "Ву (NumPy)": _batch("Ву"),
+}
+
+
+def measure(run, segments, repeat=3):
+    """Лучшее время из repeat запусков, число пикселей и пиковая память (байт)."""
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        pixels = run(segments)
+        best = min(best, time.perf_counter() - start)
+
+    # Память меряется отдельным запуском: трассировка сильно замедляет код
+    tracemalloc.start()
+    run(segments)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, pixels, peak
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Сравнение алгоритмов построения отрезков.")
+    parser.add_argument("--count", type=int, default=2000, help="число отрезков")
+    parser.add_argument("--min-length", type=float, default=1, help="минимальная длина отрезка")
+    parser.add_argument("--max-length", type=float, default=700, help="максимальная длина отрезка")
+    parser.add_argument("--slope", choices=SLOPES, default="any", help="наклон отрезков")
+    parser.add_argument("--seed", type=int, default=0, help="начальное значение генератора")
+    parser.add_argument("--repeat", type=int, default=3, help="число запусков (берётся лучшее время)")
+    parser.add_argument("--algorithms", nargs="+", choices=ALGORITHMS, default=list(ALGORITHMS),
+                        metavar="ALGORITHM", help="алгоритмы для сравнения: " + ", ".join(ALGORITHMS))
+    args = parser.parse_args(argv)
+    if args.count < 1 or args.repeat < 1:
+        parser.error("--count and --repeat must be positive")
+    if not 0 <= args.min_length <= args.max_length:
+        parser.error("lengths must satisfy 0 <= --min-length <= --max-length")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    segments = random_segments(args.count, args.min_length, args.max_length, args.slope, args.seed)
+
+    print(f"{args.count} отрезков, длина {args.min_length:g}..{args.max_length:g}, наклон {args.slope}")
+    print(f"{'алгоритм':>20} {'пикселей':>10} {'Мпикс/с':>8} {'мкс/отрезок':>12} {'пик памяти':>12}")
+    for name in args.algorithms:
+        elapsed, pixels, peak = measure(ALGORITHMS[name], segments, args.repeat)
+        print(f"{name:>20} {pixels:>10} {pixels / elapsed / 1e6:>8.2f} "
+              f"{elapsed / args.count * 1e6:>12.2f} {peak / 1024:>9.0f} КБ")
+
+    # Итерации цикла: у Брезенхема одна на пиксель
+    single = sum(max(abs(x2 - x1), abs(y2 - y1)) + 1 for x1, y1, x2, y2 in segments)
+    double = sum(double_step_iterations(*seg) for seg in segments)
+    print(f"Итерации: Брезенхем {single}, двойной шаг {double} (в {single / double:.1f} раза меньше)")
+
+
+if __name__ == "__main__":
+    main()
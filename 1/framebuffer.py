@@ -0,0 +1,225 @@
+"""
+Буфер кадра для графического редактора.
+
+Изображение хранится в массиве NumPy формы (высота, ширина, 3) и выводится на
+холст одним PhotoImage, поэтому число элементов холста не зависит от того,
+сколько отрезков нарисовано.
+"""
+import struct
+import tkinter as tk
+import zlib
+from functools import lru_cache
+
+import numpy as np
+
+BACKGROUND = (255, 255, 255)
+GRID_COLOR = (0xf0, 0xf0, 0xf0)  # Очень светло-серые линии сетки
+
+
+def ppm_bytes(pixels):
+    """Кодирует RGB-массив в двоичный PPM (P6)."""
+    height, width = pixels.shape[:2]
+    header = b"P6 %d %d 255 " % (width, height)
+    return header + np.ascontiguousarray(pixels, dtype=np.uint8).tobytes()
+
+
+def png_bytes(pixels, level=1):
+    """
+    Кодирует RGB-массив в PNG. Все строки получают фильтр 0 (без фильтра) и сжимаются
+    одним вызовом zlib; низкий уровень сжатия почти не увеличивает файл с однотонным фоном.
+    """
+    height, width = pixels.shape[:2]
+    rows = np.empty((height, 1 + 3 * width), dtype=np.uint8)
+    rows[:, 0] = 0  # Байт типа фильтра в начале каждой строки
+    rows[:, 1:] = np.asarray(pixels, dtype=np.uint8).reshape(height, 3 * width)
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)  # 8 бит на канал, RGB
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+            + chunk(b"IDAT", zlib.compress(rows.tobytes(), level)) + chunk(b"IEND", b""))
+
+
+def save_image(path, pixels):
+    """Сохраняет RGB-массив в файл PNG или PPM (формат выбирается по расширению)."""
+    data = ppm_bytes(pixels) if str(path).lower().endswith(".ppm") else png_bytes(pixels)
+    with open(path, "wb") as file:
+        file.write(data)
+
+
+def upload(image, pixels, x=0, y=0):
+    """Записывает RGB-массив в PhotoImage одним вызовом, начиная с точки (x, y)."""
+    image.tk.call(image.name, "put", ppm_bytes(pixels), "-format", "ppm", "-to", x, y)
+
+
+@lru_cache(maxsize=None)
+def intensity_lut(gamma=1.0):
+    """
+    Таблица из 256 оттенков серого: интенсивность чёрной «краски» 0..255 -> значение канала.
+    При gamma != 1 частичное покрытие переводится из линейной яркости в гамма-кодированную,
+    поэтому сглаженные края не выглядят темнее, чем должны.
+    """
+    coverage = np.arange(256) / 255
+    lut = np.rint(255 * (1 - coverage) ** (1 / gamma)).astype(np.uint8)
+    lut.flags.writeable = False
+    return lut
+
+
+@lru_cache(maxsize=None)
+def grid_tile(step=1, color=GRID_COLOR, background=BACKGROUND):
+    """Одна клетка сетки step x step: линия сверху и слева. Кэшируется по шагу (масштабу) и цветам."""
+    tile = np.empty((step, step, 3), dtype=np.uint8)
+    tile[:] = background
+    tile[:, 0] = color
+    tile[0, :] = color
+    tile.flags.writeable = False  # Общий кэшированный массив нельзя менять
+    return tile
+
+
+def grid_image(width, height, step=1, color=GRID_COLOR, background=BACKGROUND):
+    """
+    Сетка размером width x height с линиями через каждые step пикселей, замощённая из
+    кэшированной клетки grid_tile. Полные изображения не кэшируются: при каждом изменении
+    размера окна получался бы новый массив во весь холст.
+    """
+    tile = grid_tile(step, color, background)
+    return np.tile(tile, (-(-height // step), -(-width // step), 1))[:height, :width]
+
+
+class FrameBuffer:
+    """RGB-буфер, показываемый на холсте через один PhotoImage."""
+
+    def __init__(self, canvas, width, height, background=BACKGROUND, gamma=1.0):
+        self.canvas = canvas
+        self.width = width
+        self.height = height
+        self.background = np.empty((height, width, 3), dtype=np.uint8)
+        self.background[:] = background
+        self.pixels = self.background.copy()
+        self.lut = intensity_lut(gamma)
+
+        self.image = tk.PhotoImage(master=canvas, width=width, height=height)
+        self.item = canvas.create_image(0, 0, image=self.image, anchor=tk.NW)
+        self._dirty_rect = (0, 0, width, height)  # Изменённая область (x0, y0, x1, y1) или None
+        self._flush_scheduled = False
+
+    def mark_dirty(self, x0=0, y0=0, x1=None, y1=None):
+        """Добавляет прямоугольник [x0, x1) x [y0, y1) к области, которую нужно выгрузить."""
+        x1 = self.width if x1 is None else x1
+        y1 = self.height if y1 is None else y1
+        x0, y0 = max(int(x0), 0), max(int(y0), 0)
+        x1, y1 = min(int(x1), self.width), min(int(y1), self.height)
+        if x0 >= x1 or y0 >= y1:
+            return
+        if self._dirty_rect is not None:
+            dx0, dy0, dx1, dy1 = self._dirty_rect
+            x0, y0, x1, y1 = min(x0, dx0), min(y0, dy0), max(x1, dx1), max(y1, dy1)
+        self._dirty_rect = (x0, y0, x1, y1)
+
+    def resize(self, width, height):
+        """Меняет размер буфера; содержимое и фон сбрасываются, их нужно нарисовать заново."""
+        self.width = width
+        self.height = height
+        self.background = np.empty((height, width, 3), dtype=np.uint8)
+        self.background[:] = BACKGROUND
+        self.pixels = self.background.copy()
+        self.image.configure(width=width, height=height)
+        self._dirty_rect = None
+        self.mark_dirty()
+
+    def set_gamma(self, gamma):
+        """Выбирает таблицу интенсивностей для последующего рисования."""
+        self.lut = intensity_lut(gamma)
+
+    def set_background(self, background):
+        """Задаёт новый фон (цвет или массив) и очищает буфер."""
+        self.background[:] = background
+        self.clear()
+
+    def clear(self):
+        """Возвращает буфер к фону."""
+        self.pixels[:] = self.background
+        self.mark_dirty()
+
+    def snapshot(self):
+        """Копия текущего содержимого буфера."""
+        return self.pixels.copy()
+
+    def restore(self, pixels):
+        """Возвращает буфер к ранее сделанному снимку."""
+        self.pixels[:] = pixels
+        self.mark_dirty()
+
+    def restore_region(self, pixels, rect):
+        """Возвращает прямоугольник rect = (x0, y0, x1, y1) из снимка; остальное не трогает."""
+        x0, y0, x1, y1 = rect
+        self.pixels[y0:y1, x0:x1] = pixels[y0:y1, x0:x1]
+        self.mark_dirty(x0, y0, x1, y1)
+
+    def put_pixels(self, xs, ys, brightness):
+        """
+        Закрашивает пиксели чёрным с заданной яркостью (1 — полностью закрашен).
+        При наложении остаётся более тёмный цвет, поэтому сглаженные края
+        не осветляют уже нарисованные линии.
+        """
+        levels = np.rint(255 * np.asarray(brightness, dtype=np.float64)).astype(np.uint8)
+        self.put_levels(xs, ys, levels)
+
+    def put_levels(self, xs, ys, levels):
+        """Закрашивает пиксели с целочисленной интенсивностью 0..255 через таблицу оттенков."""
+        xs = np.asarray(xs, dtype=np.int64)
+        ys = np.asarray(ys, dtype=np.int64)
+        levels = np.broadcast_to(np.asarray(levels, dtype=np.uint8), xs.shape)
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        if not inside.any():
+            return
+        xs, ys = xs[inside], ys[inside]
+        np.minimum.at(self.pixels, (ys, xs), self.lut[levels[inside]][:, None])
+        self.mark_dirty(xs.min(), ys.min(), xs.max() + 1, ys.max() + 1)
+
+    def put_spans(self, spans, steep, brightness=1):
+        """
+        Закрашивает серии пикселей: (x_min, x_max, y) для горизонтальных серий
+        или (x, y_min, y_max) для вертикальных (steep). Каждая серия — одна запись в срез буфера.
+        """
+        shade = self.lut[round(255 * brightness)]
+        for span in spans:
+            if steep:
+                x, lo, hi = span
+                if not 0 <= x < self.width or hi < 0:
+                    continue
+                line = self.pixels[max(lo, 0):hi + 1, x]
+                self.mark_dirty(x, lo, x + 1, hi + 1)
+            else:
+                lo, hi, y = span
+                if not 0 <= y < self.height or hi < 0:
+                    continue
+                line = self.pixels[y, max(lo, 0):hi + 1]
+                self.mark_dirty(lo, y, hi + 1, y + 1)
+            np.minimum(line, shade, out=line)
+
+    def crop(self, x, y, width, height, fill=BACKGROUND):
+        """Копия прямоугольной области буфера; всё, что за его пределами, заполняется цветом fill."""
+        region = np.empty((height, width, 3), dtype=np.uint8)
+        region[:] = fill
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + width, self.width), min(y + height, self.height)
+        if x0 < x1 and y0 < y1:
+            region[y0 - y:y1 - y, x0 - x:x1 - x] = self.pixels[y0:y1, x0:x1]
+        return region
+
+    def flush(self):
+        """Выгружает в PhotoImage только изменённую прямоугольную область буфера."""
+        self._flush_scheduled = False
+        if self._dirty_rect is None:
+            return
+        x0, y0, x1, y1 = self._dirty_rect
+        upload(self.image, self.pixels[y0:y1, x0:x1], x0, y0)
+        self._dirty_rect = None
+
+    def schedule_flush(self):
+        """Откладывает выгрузку до простоя цикла событий (не чаще раза за кадр)."""
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.canvas.after_idle(self.flush)
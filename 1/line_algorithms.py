@@ -0,0 +1,504 @@
+"""
+Алгоритмы построения отрезков без графического интерфейса.
+
+generate_line_* возвращают список пикселей (x, y, яркость) целиком.
+Пошаговые версии iter_line_* выдают кортежи (x, y, яркость, состояние), где
+состояние — словарь решающих переменных алгоритма на этом шаге; пиксели те же,
+но вычисляются лениво: следующий шаг считается только когда он запрошен.
+
+Все они принимают необязательный диапазон шагов first..last по главной оси
+(его возвращает clip_line): тогда строятся только пиксели этих шагов исходного
+отрезка, а работа зависит от длины диапазона, а не всего отрезка. Только ЦДА и
+вещественный Ву повторяют до шага first одни сложения, чтобы округление совпало.
+
+Здесь же — вариант Брезенхема, строящий отрезок сериями пикселей, и
+отсечение отрезка по границам холста.
+"""
+import math
+
+# Насколько прямоугольник отсечения расширяется: пиксель внутри может отстоять от самой
+# прямой по второй оси на полпикселя (ЦДА, Брезенхем) и почти на два (вторая строка Ву)
+CLIP_MARGIN = 2
+
+
+# Алгоритм ЦДА
+def generate_line_dda(x1, y1, x2, y2, first=0, last=None):
+    steps_list = []
+    dx = x2 - x1
+    dy = y2 - y1
+    steps = max(abs(dx), abs(dy))
+    if steps == 0:
+        return [(x1, y1, 1)]
+    last = steps if last is None else last
+    x_increment = dx / steps
+    y_increment = dy / steps
+    x, y = x1, y1
+    for _ in range(first):  # То же накопление до шага first, иначе половины округлялись бы иначе
+        x += x_increment
+        y += y_increment
+    for _ in range(last - first + 1):
+        steps_list.append((round(x), round(y), 1))
+        x += x_increment
+        y += y_increment
+    return steps_list
+
+
+def _bresenham_start(x1, y1, x2, y2, first):
+    """Пиксель и ошибка err алгоритма Брезенхема на шаге first по главной оси, без прохода по предыдущим."""
+    dx = abs(x2 - x1)
+    dy = abs(y2 - y1)
+    sx = 1 if x1 < x2 else -1
+    sy = 1 if y1 < y2 else -1
+    n, m = max(dx, dy), min(dx, dy)
+    k = (2 * m * first + n - 1) // (2 * n) if n else 0  # Шагов по второй оси к шагу first
+    # Каждый шаг по x уменьшает err на dy, каждый шаг по y увеличивает на dx
+    if dx >= dy:
+        return x1 + sx * first, y1 + sy * k, dx - dy - first * dy + k * dx
+    return x1 + sx * k, y1 + sy * first, dx - dy - k * dy + first * dx
+
+
+# Целочисленный алгоритм Брезенхема
+def generate_line_bresenham(x1, y1, x2, y2, first=0, last=None):
+    steps_list = []
+    dx = abs(x2 - x1)
+    dy = abs(y2 - y1)
+    sx = 1 if x1 < x2 else -1
+    sy = 1 if y1 < y2 else -1
+    err = dx - dy
+    last = max(dx, dy) if last is None else last
+    if first:
+        x1, y1, err = _bresenham_start(x1, y1, x2, y2, first)
+
+    for _ in range(last - first):
+        steps_list.append((x1, y1, 1))
+        e2 = 2 * err
+        if e2 > -dy:
+            err -= dy
+            x1 += sx
+        if e2 < dx:
+            err += dx
+            y1 += sy
+    steps_list.append((x1, y1, 1))
+    return steps_list
+
+# Алгоритм Ву
+def generate_line_wu(x1, y1, x2, y2, first=0, last=None):
+    steps_list = []
+    dx = abs(x2 - x1)
+    dy = abs(y2 - y1)
+    steep = dy > dx
+    last = max(dx, dy) if last is None else last
+
+    if steep:
+        x1, y1 = y1, x1
+        x2, y2 = y2, x2
+    if x1 > x2:
+        x1, x2 = x2, x1
+        y1, y2 = y2, y1
+        first, last = x2 - x1 - last, x2 - x1 - first  # Шаги теперь считаются от другого конца
+
+    dx = x2 - x1
+    dy = y2 - y1
+    gradient = dy / dx if dx != 0 else 1
+
+    xend = round(x1)
+    yend = y1 + gradient * (xend - x1)
+    xpxl1 = xend
+    ypxl1 = int(yend)
+    if first == 0:
+        if steep:
+            steps_list.append((ypxl1, xpxl1, 1 - (yend - int(yend))))
+            steps_list.append((ypxl1 + 1, xpxl1, yend - int(yend)))
+        else:
+            steps_list.append((xpxl1, ypxl1, 1 - (yend - int(yend))))
+            steps_list.append((xpxl1, ypxl1 + 1, yend - int(yend)))
+
+    xend = round(x2)
+    yend = y2 + gradient * (xend - x2)
+    xpxl2 = xend
+    ypxl2 = int(yend)
+    if last == dx:
+        if steep:
+            steps_list.append((ypxl2, xpxl2, 1 - (yend - int(yend))))
+            steps_list.append((ypxl2 + 1, xpxl2, yend - int(yend)))
+        else:
+            steps_list.append((xpxl2, ypxl2, 1 - (yend - int(yend))))
+            steps_list.append((xpxl2, ypxl2 + 1, yend - int(yend)))
+
+    start = max(first, 1)
+    intery = y1 + gradient
+    for _ in range(start - 1):  # То же накопление до шага first, что и у целого отрезка
+        intery += gradient
+    for x in range(xpxl1 + start, xpxl1 + min(last, dx - 1) + 1):
+        if steep:
+            steps_list.append((int(intery), x, 1 - (intery - int(intery))))
+            steps_list.append((int(intery) + 1, x, intery - int(intery)))
+        else:
+            steps_list.append((x, int(intery), 1 - (intery - int(intery))))
+            steps_list.append((x, int(intery) + 1, intery - int(intery)))
+        intery += gradient
+    return steps_list
+
+
+def iter_line_dda(x1, y1, x2, y2, first=0, last=None):
+    """Алгоритм ЦДА."""
+    dx = x2 - x1
+    dy = y2 - y1
+    steps = max(abs(dx), abs(dy))
+    if steps == 0:
+        yield x1, y1, 1, {"x": x1, "y": y1}
+        return
+    last = steps if last is None else last
+    x_increment = dx / steps
+    y_increment = dy / steps
+    x, y = x1, y1
+    for _ in range(first):  # То же накопление до шага first, иначе половины округлялись бы иначе
+        x += x_increment
+        y += y_increment
+    for _ in range(last - first + 1):
+        yield round(x), round(y), 1, {"x": x, "y": y}
+        x += x_increment
+        y += y_increment
+
+
+def iter_line_bresenham(x1, y1, x2, y2, first=0, last=None):
+    """Целочисленный алгоритм Брезенхема."""
+    dx = abs(x2 - x1)
+    dy = abs(y2 - y1)
+    sx = 1 if x1 < x2 else -1
+    sy = 1 if y1 < y2 else -1
+    err = dx - dy
+    last = max(dx, dy) if last is None else last
+    if first:
+        x1, y1, err = _bresenham_start(x1, y1, x2, y2, first)
+
+    for _ in range(last - first):
+        yield x1, y1, 1, {"err": err}
+        e2 = 2 * err
+        if e2 > -dy:
+            err -= dy
+            x1 += sx
+        if e2 < dx:
+            err += dx
+            y1 += sy
+    yield x1, y1, 1, {"err": err}
+
+
+def iter_line_wu(x1, y1, x2, y2, first=0, last=None):
+    """Алгоритм Ву."""
+    dx = abs(x2 - x1)
+    dy = abs(y2 - y1)
+    steep = dy > dx
+    last = max(dx, dy) if last is None else last
+
+    if steep:
+        x1, y1 = y1, x1
+        x2, y2 = y2, x2
+    if x1 > x2:
+        x1, x2 = x2, x1
+        y1, y2 = y2, y1
+        first, last = x2 - x1 - last, x2 - x1 - first
+
+    dx = x2 - x1
+    dy = y2 - y1
+    gradient = dy / dx if dx != 0 else 1
+
+    def plot(x, y, brightness, intery):
+        state = {"intery": intery, "gradient": gradient}
+        return (y, x, brightness, state) if steep else (x, y, brightness, state)
+
+    # Концевые точки: координаты целые, поэтому вся яркость достаётся первому пикселю
+    for xend, yend, step in ((x1, y1, 0), (x2, y2, dx)):
+        if first <= step <= last:
+            yield plot(xend, yend, 1, yend)
+            yield plot(xend, yend + 1, 0, yend)
+
+    start = max(first, 1)
+    intery = y1 + gradient
+    for _ in range(start - 1):  # То же накопление до шага first, что и у целого отрезка
+        intery += gradient
+    for x in range(x1 + start, x1 + min(last, dx - 1) + 1):
+        yield plot(x, int(intery), 1 - (intery - int(intery)), intery)
+        yield plot(x, int(intery) + 1, intery - int(intery), intery)
+        intery += gradient
+
+
+def bresenham_runs(x1, y1, x2, y2, first=0, last=None):
+    """
+    Алгоритм Брезенхема с сериями (run-slice): вместо отдельных пикселей
+    возвращает горизонтальные или вертикальные отрезки из тех же пикселей.
+
+    Возвращает (steep, spans). Для пологого отрезка (steep = False) spans —
+    список (x_min, x_max, y), для крутого — (x, y_min, y_max).
+    """
+    dx = abs(x2 - x1)
+    dy = abs(y2 - y1)
+    steep = dy > dx
+    if steep:
+        n, m = dy, dx
+        a, b, sa, sb = y1, x1, (1 if y1 < y2 else -1), (1 if x1 < x2 else -1)
+    else:
+        n, m = dx, dy
+        a, b, sa, sb = x1, y1, (1 if x1 < x2 else -1), (1 if y1 < y2 else -1)
+    last = n if last is None else last
+
+    def span(start, stop, k):
+        lo, hi = sorted((a + sa * start, a + sa * stop))
+        return (b + sb * k, lo, hi) if steep else (lo, hi, b + sb * k)
+
+    if m == 0:
+        return steep, [span(first, last, 0)]
+
+    # На шаге i по главной оси generate_line_bresenham смещается по второй оси на
+    # floor((2*m*i + n - 1) / (2*n)), значит серия k заканчивается на шаге
+    # floor(n * (2k + 1) / (2m)). Конец серии считается целочисленно, без деления на каждом шаге.
+    # Серии с первой до последней в диапазоне шагов; конец серии k0 — n * (2k0 + 1) / (2m)
+    first_run = (2 * m * first + n - 1) // (2 * n)
+    last_run = (2 * m * last + n - 1) // (2 * n)
+    whole, adjust = divmod(2 * n, 2 * m)
+    end, error = divmod(n * (2 * first_run + 1), 2 * m)
+    spans = []
+    start = first
+    for k in range(first_run, last_run + 1):
+        stop = min(end, last)
+        spans.append(span(start, stop, k))
+        start = stop + 1
+        end += whole
+        error += adjust
+        if error >= 2 * m:
+            error -= 2 * m
+            end += 1
+    return steep, spans
+
+
+def _double_step_iterations(x1, y1, x2, y2, first=0, last=None):
+    """
+    Симметричный алгоритм с двойным шагом: отрезок строится одновременно от
+    обоих концов к середине, и на каждом конце за одну итерацию выбирается
+    шаблон из двух пикселей. Выдаёт кортежи (пиксели итерации, остаток
+    переднего конца, остаток заднего конца); пиксели — тройки (x, y, 1).
+
+    Ошибка хранится как остаток r = (2*m*i + n - 1) mod 2n, где n и m — длины
+    по главной и второй оси. Это то же правило округления, что и у
+    generate_line_bresenham, поэтому множество пикселей совпадает, а на обоих
+    концах остаток одинаков (n - 1). По той же формуле концы ставятся сразу на шаги
+    first и last, если строится только часть отрезка.
+    """
+    dx = abs(x2 - x1)
+    dy = abs(y2 - y1)
+    sx = 1 if x1 < x2 else -1
+    sy = 1 if y1 < y2 else -1
+    if dx >= dy:
+        n, m = dx, dy
+        ux, uy, vx, vy = sx, 0, 0, sy  # шаг по главной и по второй оси
+    else:
+        n, m = dy, dx
+        ux, uy, vx, vy = 0, sy, sx, 0
+
+    if n == 0:
+        yield ((x1, y1, 1),), n - 1, n - 1
+        return
+    last = n if last is None else last
+    k, front = divmod(2 * m * first + n - 1, 2 * n)
+    fx, fy = x1 + first * ux + k * vx, y1 + first * uy + k * vy
+    k, back = divmod(2 * m * last + n - 1, 2 * n)
+    bx, by = x1 + last * ux + k * vx, y1 + last * uy + k * vy
+    if first == last:
+        yield ((fx, fy, 1),), front, back
+        return
+    yield ((fx, fy, 1), (bx, by, 1)), front, back
+
+    two_m, four_m, two_n, four_n = 2 * m, 4 * m, 2 * n, 4 * n
+    i, j = first, last
+    while j - i > 4:
+        # Передний конец: шаблон из двух пикселей по остатку через два шага
+        r = front + four_m
+        if r < two_n:
+            f1 = (fx + ux, fy + uy, 1)
+            fx, fy = fx + 2 * ux, fy + 2 * uy
+        elif r >= four_n:
+            f1 = (fx + ux + vx, fy + uy + vy, 1)
+            fx, fy = fx + 2 * (ux + vx), fy + 2 * (uy + vy)
+            r -= four_n
+        else:
+            if front + two_m >= two_n:
+                f1 = (fx + ux + vx, fy + uy + vy, 1)
+            else:
+                f1 = (fx + ux, fy + uy, 1)
+            fx, fy = fx + 2 * ux + vx, fy + 2 * uy + vy
+            r -= two_n
+        front = r
+
+        # Задний конец: то же самое в обратную сторону
+        r = back - four_m
+        if r >= 0:
+            b1 = (bx - ux, by - uy, 1)
+            bx, by = bx - 2 * ux, by - 2 * uy
+        elif r < -two_n:
+            b1 = (bx - ux - vx, by - uy - vy, 1)
+            bx, by = bx - 2 * (ux + vx), by - 2 * (uy + vy)
+            r += four_n
+        else:
+            if back - two_m < 0:
+                b1 = (bx - ux - vx, by - uy - vy, 1)
+            else:
+                b1 = (bx - ux, by - uy, 1)
+            bx, by = bx - 2 * ux - vx, by - 2 * uy - vy
+            r += two_n
+        back = r
+
+        i += 2
+        j -= 2
+        yield (f1, (fx, fy, 1), b1, (bx, by, 1)), front, back
+
+    # Середина: не больше трёх пикселей, обычные одиночные шаги
+    while j - i > 1:
+        front += two_m
+        fx, fy = fx + ux, fy + uy
+        if front >= two_n:
+            front -= two_n
+            fx, fy = fx + vx, fy + vy
+        i += 1
+        yield ((fx, fy, 1),), front, back
+
+
+def generate_line_double_step(x1, y1, x2, y2, first=0, last=None):
+    """Симметричный алгоритм с двойным шагом; пиксели те же, что у алгоритма Брезенхема."""
+    steps_list = []
+    for pixels, _, _ in _double_step_iterations(x1, y1, x2, y2, first, last):
+        steps_list += pixels
+    return steps_list
+
+
+def iter_line_double_step(x1, y1, x2, y2, first=0, last=None):
+    """Пошаговая версия симметричного алгоритма с двойным шагом."""
+    for pixels, front, back in _double_step_iterations(x1, y1, x2, y2, first, last):
+        for x, y, brightness in pixels:
+            yield x, y, brightness, {"front": front, "back": back}
+
+
+def double_step_iterations(x1, y1, x2, y2):
+    """Число итераций цикла симметричного алгоритма с двойным шагом (у Брезенхема — одна на пиксель)."""
+    return sum(1 for _ in _double_step_iterations(x1, y1, x2, y2))
+
+
+def _wu_int_steps(x1, y1, x2, y2, first=0, last=None):
+    """
+    Целочисленный алгоритм Ву с 16-битным накопителем ошибки (как в оригинале Ву).
+    Интенсивность пикселя берётся из старших 8 бит накопителя, без вещественной арифметики.
+    Выдаёт (x, y, интенсивность 0..255, накопитель ошибки).
+    """
+    n = max(abs(x2 - x1), abs(y2 - y1))
+    last = n if last is None else last
+    if y1 > y2:  # Рисуем сверху вниз
+        x1, y1, x2, y2 = x2, y2, x1, y1
+        first, last = n - last, n - first
+    if first == 0:
+        yield x1, y1, 255, 0
+
+    xdir = 1 if x2 >= x1 else -1
+    dx = abs(x2 - x1)
+    dy = y2 - y1
+    if dx == 0 and dy == 0:
+        return
+
+    # Горизонтальные, вертикальные и диагональные отрезки не нуждаются в сглаживании
+    if dy == 0 or dx == 0 or dx == dy:
+        sx = xdir if dx else 0
+        sy = 1 if dy else 0
+        for i in range(max(first, 1), last + 1):
+            yield x1 + sx * i, y1 + sy * i, 255, 0
+        return
+
+    # Состояние перед первым шагом цикла: после i прибавлений накопитель переполнился
+    # (i * error_adj) >> 16 раз, а в нём остались младшие 16 бит
+    start = max(first, 1) - 1
+    count = min(last, n - 1) - start
+    if dy > dx:
+        # Главная ось Y: накопитель показывает, насколько линия ушла к соседнему по X пикселю
+        error_adj = (dx << 16) // dy
+        error_acc = (start * error_adj) & 0xFFFF
+        x, y = x1 + xdir * ((start * error_adj) >> 16), y1 + start
+        for _ in range(count):
+            previous = error_acc
+            error_acc = (error_acc + error_adj) & 0xFFFF
+            if error_acc <= previous:  # Переполнение — переходим к следующему X
+                x += xdir
+            y += 1
+            weighting = error_acc >> 8
+            yield x, y, weighting ^ 255, error_acc
+            yield x + xdir, y, weighting, error_acc
+    else:
+        error_adj = (dy << 16) // dx
+        error_acc = (start * error_adj) & 0xFFFF
+        x, y = x1 + xdir * start, y1 + ((start * error_adj) >> 16)
+        for _ in range(count):
+            previous = error_acc
+            error_acc = (error_acc + error_adj) & 0xFFFF
+            if error_acc <= previous:
+                y += 1
+            x += xdir
+            weighting = error_acc >> 8
+            yield x, y, weighting ^ 255, error_acc
+            yield x, y + 1, weighting, error_acc
+
+    if last == n:
+        yield x2, y2, 255, error_acc
+
+
+def generate_line_wu_int(x1, y1, x2, y2, first=0, last=None):
+    """Целочисленный алгоритм Ву: список (x, y, интенсивность 0..255)."""
+    return [(x, y, level) for x, y, level, _ in _wu_int_steps(x1, y1, x2, y2, first, last)]
+
+
+def iter_line_wu_int(x1, y1, x2, y2, first=0, last=None):
+    """Пошаговая версия целочисленного алгоритма Ву (яркость приводится к 0..1 только для отладки)."""
+    for x, y, level, error_acc in _wu_int_steps(x1, y1, x2, y2, first, last):
+        yield x, y, level / 255, {"error_acc": error_acc, "level": level}
+
+
+def clip_line(x1, y1, x2, y2, x_min, y_min, x_max, y_max):
+    """
+    Отсечение отрезка прямоугольником (алгоритм Лианга — Барски).
+    Концы не округляются и не меняются: видимая часть задаётся диапазоном шагов
+    (first, last) по главной оси, поэтому наклон остаётся исходным. Прямоугольник
+    расширен на CLIP_MARGIN, так что все пиксели отрезка внутри него попадают в диапазон.
+    Возвращает (first, last) или None, если отрезок не виден. Арифметика та же,
+    что в line_batch.clip_segments, поэтому диапазоны совпадают.
+    """
+    dx = x2 - x1
+    dy = y2 - y1
+    x_min, y_min, x_max, y_max = x_min - CLIP_MARGIN, y_min - CLIP_MARGIN, x_max + CLIP_MARGIN, y_max + CLIP_MARGIN
+    t0, t1 = 0.0, 1.0
+    for p, q in ((-dx, x1 - x_min), (dx, x_max - x1), (-dy, y1 - y_min), (dy, y_max - y1)):
+        if p == 0:
+            if q < 0:
+                return None  # Параллелен границе и лежит снаружи
+            continue
+        t = q / p
+        if p < 0:
+            t0 = max(t0, t)
+        else:
+            t1 = min(t1, t)
+    if t0 > t1:
+        return None
+    steps = max(abs(dx), abs(dy))
+    return max(math.floor(t0 * steps), 0), min(math.ceil(t1 * steps), steps)
+
+
+# Генераторы по названию алгоритма в панели инструментов
+LINE_STEPS = {
+    "ЦДА": iter_line_dda,
+    "Брезенхем": iter_line_bresenham,
+    "Ву": iter_line_wu,
+    "Двойной шаг": iter_line_double_step,
+    "Ву (целочисленный)": iter_line_wu_int,
+}
+
+
+def format_state(state):
+    """Строка с решающими переменными шага для отладочного вывода."""
+    return ", ".join(
+        f"{name}={value:.2f}" if isinstance(value, float) else f"{name}={value}"
+        for name, value in state.items()
+    )
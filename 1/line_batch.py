@@ -0,0 +1,235 @@
+"""
+Пакетная растеризация отрезков на NumPy.
+
+Принимает массив отрезков формы (N, 4) — строки (x1, y1, x2, y2) — и строит
+пиксели сразу для всех отрезков. Результат попиксельно совпадает с
+generate_line_dda / generate_line_bresenham / generate_line_wu
+из line_algorithms.py, включая порядок пикселей внутри каждого отрезка.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from line_algorithms import CLIP_MARGIN
+
+# x, y, яркость и номер отрезка, к которому относится пиксель
+PixelBatch = namedtuple("PixelBatch", ["x", "y", "brightness", "segment"])
+
+
+def as_segments(segments):
+    """Приводит входные данные к целочисленному массиву формы (N, 4)."""
+    seg = np.asarray(segments)
+    if seg.ndim == 1 and seg.size == 4:
+        seg = seg.reshape(1, 4)
+    if seg.ndim != 2 or seg.shape[1] != 4:
+        raise ValueError("Segments must be an array of shape (N, 4).")
+    if seg.size and not np.issubdtype(seg.dtype, np.integer):
+        raise ValueError("Segment endpoints must be integers.")
+    return seg.astype(np.int64, copy=False)
+
+
+def _step_range(n, first, last):
+    """Диапазон шагов [first, last] по главной оси; по умолчанию — весь отрезок [0, n]."""
+    first = np.zeros_like(n) if first is None else np.asarray(first, dtype=np.int64)
+    last = n if last is None else np.asarray(last, dtype=np.int64)
+    return first, last
+
+
+def _layout(counts):
+    """Смещения начала каждого отрезка в общем массиве и номер отрезка для каждого пикселя."""
+    starts = np.zeros(len(counts), dtype=np.int64)
+    np.cumsum(counts[:-1], out=starts[1:])
+    segment = np.repeat(np.arange(len(counts)), counts)
+    return starts, segment
+
+
+def _groups(lengths):
+    """Разбивает отрезки на группы с одинаковой длиной цикла: (длина, индексы)."""
+    order = np.argsort(lengths, kind="stable")
+    values, first = np.unique(lengths[order], return_index=True)
+    bounds = np.append(first, len(order))
+    for value, lo, hi in zip(values, bounds[:-1], bounds[1:]):
+        yield int(value), order[lo:hi]
+
+
+def _accumulate(start, increment, length):
+    """
+    Накапливает start + increment + increment + ... так же, как цикл `v += increment`.
+    Суммирование идёт последовательно по строке, поэтому ошибки округления те же.
+    """
+    acc = np.empty((len(start), length))
+    acc[:, 0] = start
+    acc[:, 1:] = increment[:, None]
+    return np.cumsum(acc, axis=1, out=acc)
+
+
+def rasterize_dda(segments, first=None, last=None):
+    """
+    Алгоритм ЦДА для массива отрезков. first и last ограничивают шаги каждого отрезка
+    (см. clip_segments); накопление тогда начинается с точки прямой на шаге first.
+    """
+    x1, y1, x2, y2 = as_segments(segments).T
+    dx = x2 - x1
+    dy = y2 - y1
+    steps = np.maximum(np.abs(dx), np.abs(dy))
+    first, last = _step_range(steps, first, last)
+    counts = last - first + 1
+    starts, segment = _layout(counts)
+
+    xs = np.empty(counts.sum(), dtype=np.int64)
+    ys = np.empty_like(xs)
+    for n, idx in _groups(counts - 1):
+        pos = starts[idx, None] + np.arange(n + 1)
+        zero = steps[idx] == 0
+        if zero.any():
+            xs[pos[zero]] = x1[idx[zero], None]
+            ys[pos[zero]] = y1[idx[zero], None]
+            idx, pos = idx[~zero], pos[~zero]
+        # round() в Python и np.rint одинаково округляют половины к чётному
+        x_increment = dx[idx] / steps[idx]
+        y_increment = dy[idx] / steps[idx]
+        xs[pos] = np.rint(_accumulate(x1[idx] + first[idx] * x_increment, x_increment, n + 1))
+        ys[pos] = np.rint(_accumulate(y1[idx] + first[idx] * y_increment, y_increment, n + 1))
+    return PixelBatch(xs, ys, np.ones(len(xs)), segment)
+
+
+def rasterize_bresenham(segments, first=None, last=None):
+    """Целочисленный алгоритм Брезенхема для массива отрезков (first и last — как у rasterize_dda)."""
+    x1, y1, x2, y2 = as_segments(segments).T
+    dx = np.abs(x2 - x1)
+    dy = np.abs(y2 - y1)
+    sx = np.where(x1 < x2, 1, -1)
+    sy = np.where(y1 < y2, 1, -1)
+    major = np.maximum(dx, dy)
+    minor = np.minimum(dx, dy)
+    first, last = _step_range(major, first, last)
+    counts = last - first + 1
+    starts, segment = _layout(counts)
+
+    # i — шаг по главной оси, k — число шагов по второстепенной оси к шагу i.
+    # Для варианта с err = dx - dy и строгими сравнениями k = floor((2*m*i + n - 1) / (2*n)).
+    i = np.arange(counts.sum()) - starts[segment] + first[segment]
+    n = major[segment]
+    k = (2 * minor[segment] * i + n - 1) // (2 * np.maximum(n, 1))
+    k[n == 0] = 0
+
+    x_major = (dx >= dy)[segment]
+    xs = x1[segment] + sx[segment] * np.where(x_major, i, k)
+    ys = y1[segment] + sy[segment] * np.where(x_major, k, i)
+    return PixelBatch(xs, ys, np.ones(len(xs)), segment)
+
+
+def rasterize_wu(segments, first=None, last=None):
+    """
+    Алгоритм Ву для массива отрезков. first и last ограничивают шаги цикла между
+    концами (как у rasterize_dda); четыре пикселя концов выдаются всегда.
+    """
+    x1, y1, x2, y2 = as_segments(segments).T
+    first, last = _step_range(np.maximum(np.abs(x2 - x1), np.abs(y2 - y1)), first, last)
+    steep = np.abs(y2 - y1) > np.abs(x2 - x1)
+    x1, y1 = np.where(steep, y1, x1), np.where(steep, x1, y1)
+    x2, y2 = np.where(steep, y2, x2), np.where(steep, x2, y2)
+    swap = x1 > x2
+    x1, x2 = np.where(swap, x2, x1), np.where(swap, x1, x2)
+    y1, y2 = np.where(swap, y2, y1), np.where(swap, y1, y2)
+
+    dx = x2 - x1
+    dy = y2 - y1
+    gradient = np.where(dx != 0, dy / np.where(dx != 0, dx, 1), 1.0)
+
+    # Шаги цикла 1..dx-1 считаются от нового начала, если концы поменялись местами
+    first, last = np.where(swap, dx - last, first), np.where(swap, dx - first, last)
+    first = np.maximum(first, 1)
+    loop = np.maximum(np.minimum(last, dx - 1) - first + 1, 0)
+    counts = 4 + 2 * loop
+    starts, segment = _layout(counts)
+
+    # Вдоль «x» (после перестановки для крутых отрезков)
+    major = np.empty(counts.sum(), dtype=np.int64)
+    minor = np.empty_like(major)
+    brightness = np.empty(len(major))
+
+    # Концевые точки: целые координаты, поэтому дробная часть равна нулю
+    for offset, (x, y, b) in enumerate([(x1, y1, 1.0), (x1, y1 + 1, 0.0),
+                                        (x2, y2, 1.0), (x2, y2 + 1, 0.0)]):
+        major[starts + offset] = x
+        minor[starts + offset] = y
+        brightness[starts + offset] = b
+
+    for n, idx in _groups(loop):
+        if n == 0:
+            continue
+        intery = _accumulate(y1[idx] + first[idx] * gradient[idx], gradient[idx], n)
+        whole = np.trunc(intery)  # int() в Python отбрасывает дробную часть к нулю
+        frac = intery - whole
+        xs = x1[idx, None] + first[idx, None] + np.arange(n)
+        pos = starts[idx, None] + 4 + 2 * np.arange(n)
+        major[pos] = xs
+        minor[pos] = whole
+        brightness[pos] = 1 - frac
+        major[pos + 1] = xs
+        minor[pos + 1] = whole + 1
+        brightness[pos + 1] = frac
+
+    steep_px = steep[segment]
+    xs = np.where(steep_px, minor, major)
+    ys = np.where(steep_px, major, minor)
+    return PixelBatch(xs, ys, brightness, segment)
+
+
+def clip_segments(segments, x_min, y_min, x_max, y_max):
+    """
+    Векторное отсечение отрезков прямоугольником (алгоритм Лианга — Барски), как clip_line.
+    Концы не округляются и не меняются: видимая часть задаётся диапазоном шагов
+    [first, last] по главной оси, поэтому наклон остаётся исходным. Прямоугольник
+    расширен на CLIP_MARGIN, так что все пиксели отрезка внутри него попадают в диапазон.
+    Возвращает (видимые отрезки (M, 4), first, last, индексы исходных отрезков).
+    """
+    seg = as_segments(segments)
+    x1, y1, x2, y2 = seg.T
+    dx = x2 - x1
+    dy = y2 - y1
+    x_min, y_min, x_max, y_max = x_min - CLIP_MARGIN, y_min - CLIP_MARGIN, x_max + CLIP_MARGIN, y_max + CLIP_MARGIN
+    t0 = np.zeros(len(seg))
+    t1 = np.ones(len(seg))
+    visible = np.ones(len(seg), dtype=bool)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for p, q in ((-dx, x1 - x_min), (dx, x_max - x1), (-dy, y1 - y_min), (dy, y_max - y1)):
+            visible &= (p != 0) | (q >= 0)
+            t = q / p
+            t0 = np.where(p < 0, np.maximum(t0, t), t0)
+            t1 = np.where(p > 0, np.minimum(t1, t), t1)
+    visible &= t0 <= t1
+
+    index = np.flatnonzero(visible)
+    steps = np.maximum(np.abs(dx), np.abs(dy))[index]
+    first = np.maximum(np.floor(t0[index] * steps), 0).astype(np.int64)
+    last = np.minimum(np.ceil(t1[index] * steps), steps).astype(np.int64)
+    return seg[index], first, last, index
+
+
+ALGORITHMS = {
+    "ЦДА": rasterize_dda,
+    "Брезенхем": rasterize_bresenham,
+    "Ву": rasterize_wu,
+}
+
+
+def rasterize(segments, algorithm, bounds=None):
+    """
+    Растеризует массив отрезков выбранным алгоритмом (название как в панели инструментов).
+    Если заданы bounds = (x_min, y_min, x_max, y_max), отрезки сначала отсекаются,
+    и работа зависит только от видимой длины. Остаются те пиксели целых отрезков, что
+    лежат внутри bounds, в том же порядке; номера отрезков остаются исходными. У ЦДА и Ву
+    накопление начинается с первого видимого шага, поэтому точка ровно на границе пикселей
+    может округлиться в другую сторону.
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+    if bounds is None:
+        return ALGORITHMS[algorithm](segments)
+    x_min, y_min, x_max, y_max = bounds
+    visible, first, last, index = clip_segments(segments, x_min, y_min, x_max, y_max)
+    batch = ALGORITHMS[algorithm](visible, first, last)
+    inside = (batch.x >= x_min) & (batch.x <= x_max) & (batch.y >= y_min) & (batch.y <= y_max)
+    return PixelBatch(batch.x[inside], batch.y[inside], batch.brightness[inside], index[batch.segment[inside]])
@@ -0,0 +1,64 @@
+"""
+Кэш «узоров» отрезков, не зависящих от положения.
+
+Целочисленные алгоритмы (Брезенхем, двойной шаг, целочисленный Ву) строят для
+отрезка (x1, y1)-(x2, y2) те же пиксели, что и для (0, 0)-(dx, dy), сдвинутые
+на (x1, y1). Поэтому смещения пикселей хранятся по ключу (алгоритм, dx, dy), и
+отрезок с уже встречавшимся направлением строится одним сложением массивов.
+
+ЦДА и вещественный Ву сюда не входят: они накапливают координаты в числах с
+плавающей точкой и округляют половины к чётному, так что их результат зависит
+от начальной точки, а не только от (dx, dy).
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from line_algorithms import generate_line_double_step, generate_line_wu_int
+from line_batch import rasterize_bresenham
+
+
+def _bresenham_offsets(dx, dy, first=0, last=None):
+    batch = rasterize_bresenham((0, 0, dx, dy), [first], None if last is None else [last])
+    return batch.x, batch.y, np.full(len(batch.x), 255, dtype=np.uint8)
+
+
+def _double_step_offsets(dx, dy, first=0, last=None):
+    xs, ys, _ = np.array(generate_line_double_step(0, 0, dx, dy, first, last), dtype=np.int64).reshape(-1, 3).T
+    return xs, ys, np.full(len(xs), 255, dtype=np.uint8)
+
+
+def _wu_int_offsets(dx, dy, first=0, last=None):
+    xs, ys, levels = np.array(generate_line_wu_int(0, 0, dx, dy, first, last), dtype=np.int64).reshape(-1, 3).T
+    return xs, ys, levels.astype(np.uint8)
+
+
+# Алгоритмы, результат которых зависит только от (dx, dy)
+PATTERNS = {
+    "Брезенхем": _bresenham_offsets,
+    "Двойной шаг": _double_step_offsets,
+    "Ву (целочисленный)": _wu_int_offsets,
+}
+
+
+@lru_cache(maxsize=4096)
+def line_pattern(algorithm, dx, dy):
+    """Смещения пикселей отрезка (0, 0)-(dx, dy) и их интенсивности 0..255 (только для чтения)."""
+    pattern = PATTERNS[algorithm](dx, dy)
+    for array in pattern:
+        array.flags.writeable = False  # Массивы общие для всех отрезков с этим направлением
+    return pattern
+
+
+def rasterize_line(algorithm, x1, y1, x2, y2, first=0, last=None):
+    """
+    Пиксели отрезка по кэшированному узору: массивы x, y и интенсивностей 0..255.
+    Если задан диапазон шагов first..last (см. line_algorithms.clip_line), строятся
+    только пиксели этих шагов, без кэша: узор части отрезка редко повторяется.
+    """
+    dx, dy = x2 - x1, y2 - y1
+    if first == 0 and last in (None, max(abs(dx), abs(dy))):
+        dxs, dys, levels = line_pattern(algorithm, dx, dy)
+    else:
+        dxs, dys, levels = PATTERNS[algorithm](dx, dy, first, last)
+    return dxs + x1, dys + y1, levels
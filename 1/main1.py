@@ -1,32 +1,88 @@
 import tkinter as tk
+from array import array
+from tkinter import filedialog, messagebox
+
+import numpy as np
+
+from framebuffer import FrameBuffer, grid_image, save_image, upload
+from line_algorithms import (LINE_STEPS, bresenham_runs, clip_line, format_state, generate_line_dda,
+                             generate_line_wu)
+from line_patterns import PATTERNS, rasterize_line
+from scene import Scene, Segment
+from thick_lines import thick_line, thick_line_aa, thick_line_spans
+
+CANVAS_WIDTH = 600
+CANVAS_HEIGHT = 400
+MAX_LINE_WIDTH = 50
+ANTIALIASED = ("Ву", "Ву (целочисленный)")  # Алгоритмы со сглаживанием
+GRID_STEP = 1  # Шаг сетки в пикселях
+MAGNIFIER_FRAME_MS = 16  # Не чаще одного обновления лупы за кадр (~60 Гц)
+AUTOPLAY_DELAY_MS = 50  # Пауза между шагами при автопроигрывании
+GAMMA = 2.2  # Гамма для сглаженных линий
 
 class LineEditorApp:
     def __init__(self, root):
         self.root = root
         self.root.title("Графический редактор")
 
+        # Меню
+        menu_bar = tk.Menu(root)
+        file_menu = tk.Menu(menu_bar, tearoff=0)
+        file_menu.add_command(label="Экспорт…", command=self.export_image)
+        menu_bar.add_cascade(label="Файл", menu=file_menu)
+        root.config(menu=menu_bar)
+
         # Панель инструментов
         toolbar = tk.Frame(root)
         toolbar.pack(side=tk.TOP, fill=tk.X)
 
         # Кнопки для выбора алгоритма
-        algorithms = ["ЦДА", "Брезенхем", "Ву"]
+        algorithms = ["ЦДА", "Брезенхем", "Ву", "Двойной шаг", "Ву (целочисленный)"]
         self.algorithm_var = tk.StringVar(value=algorithms[0])
         for alg in algorithms:
             btn = tk.Radiobutton(toolbar, text=alg, variable=self.algorithm_var, value=alg)
             btn.pack(side=tk.LEFT)
 
+        # Толщина линии
+        tk.Label(toolbar, text="Толщина").pack(side=tk.LEFT)
+        self.line_width = tk.IntVar(value=1)
+        tk.Spinbox(toolbar, from_=1, to=MAX_LINE_WIDTH, width=3, textvariable=self.line_width).pack(side=tk.LEFT)
+
         # Флажок для включения отладочного режима
         self.debug_mode = tk.BooleanVar(value=False)
         debug_checkbox = tk.Checkbutton(toolbar, text="Отладочный режим", variable=self.debug_mode)
         debug_checkbox.pack(side=tk.LEFT)
 
+        # Флажок гамма-коррекции сглаженных линий
+        self.gamma_enabled = tk.BooleanVar(value=False)
+        gamma_checkbox = tk.Checkbutton(toolbar, text="Гамма", variable=self.gamma_enabled, command=self.update_gamma)
+        gamma_checkbox.pack(side=tk.LEFT)
+
         # Кнопка "Шаг"
         self.step_button = tk.Button(toolbar, text="Шаг", command=self.step_through_algorithm, state=tk.DISABLED)
         self.step_button.pack(side=tk.LEFT)
 
+        # Выполнение нескольких шагов подряд и автопроигрывание
+        self.run_count = tk.IntVar(value=10)
+        self.run_count_spinbox = tk.Spinbox(toolbar, from_=1, to=10000, width=6, textvariable=self.run_count, state=tk.DISABLED)
+        self.run_count_spinbox.pack(side=tk.LEFT)
+        self.run_button = tk.Button(toolbar, text="Выполнить N шагов", command=self.run_steps, state=tk.DISABLED)
+        self.run_button.pack(side=tk.LEFT)
+        self.autoplay_button = tk.Button(toolbar, text="Авто", command=self.toggle_autoplay, state=tk.DISABLED)
+        self.autoplay_button.pack(side=tk.LEFT)
+
+        # Отмена, повтор и очистка
+        tk.Button(toolbar, text="Отменить", command=self.undo).pack(side=tk.LEFT)
+        tk.Button(toolbar, text="Повторить", command=self.redo).pack(side=tk.LEFT)
+        tk.Button(toolbar, text="Очистить", command=self.clear_canvas).pack(side=tk.LEFT)
+
+        # Перемотка по уже выполненным шагам текущей линии
+        self.seek_scale = tk.Scale(root, from_=0, to=0, orient=tk.HORIZONTAL, label="Перемотка",
+                                   command=self.seek_step, state=tk.DISABLED)
+        self.seek_scale.pack(side=tk.TOP, fill=tk.X)
+
         # Холст для рисования
-        self.canvas = tk.Canvas(root, width=600, height=400, bg="white")
+        self.canvas = tk.Canvas(root, width=CANVAS_WIDTH, height=CANVAS_HEIGHT, bg="white")
         self.canvas.pack(fill=tk.BOTH, expand=True)
 
         # Текстовое поле для отладочной информации
@@ -37,6 +93,9 @@ class LineEditorApp:
         # Лупа (увеличенное изображение)
         self.magnifier_window = None
         self.magnifier_canvas = None
+        self.magnifier_image = None
+        self.magnifier_pos = (0, 0)  # Последнее положение курсора
+        self.magnifier_job = None  # Запланированное обновление лупы
         self.magnification_factor = 10  # Масштаб увеличения
         self.magnifier_size = 100  # Размер лупы (в пикселях)
 
@@ -45,77 +104,312 @@ class LineEditorApp:
         self.start_y = None
         self.end_x = None
         self.end_y = None
-        self.steps = []  # Список шагов для текущего алгоритма
         self.current_step = 0  # Текущий шаг
 
+        # Нарисованные отрезки с кэшем пикселей (для перерисовки и отмены)
+        self.scene = Scene(self.rasterize_segment)
+
+        # Отладочный режим: шаги берутся из генератора по одному и записываются в компактные массивы
+        self.step_source = None
+        self.trace_x = array("i")
+        self.trace_y = array("i")
+        self.trace_brightness = array("d")
+        self.line_base = None  # Снимок буфера кадра до начала линии (для перемотки)
+        self.autoplay_job = None
+
+        # Предварительный показ отрезка при перетаскивании
+        self.drag_base = None  # Снимок буфера кадра на момент нажатия кнопки мыши
+        self.preview_rect = None  # Прямоугольник, занятый текущим предварительным отрезком
+
         # Привязка событий мыши
         self.canvas.bind("<Button-1>", self.on_mouse_down)
         self.canvas.bind("<B1-Motion>", self.on_mouse_drag)
         self.canvas.bind("<ButtonRelease-1>", self.on_mouse_up)
         self.canvas.bind("<Motion>", self.update_magnifier)
+        self.canvas.bind("<Configure>", self.on_canvas_resize)
+        self.root.bind("<Control-z>", self.undo)
+        self.root.bind("<Control-y>", self.redo)
+
+        # Буфер кадра: все пиксели отрезков попадают в одно изображение
+        self.framebuffer = FrameBuffer(self.canvas, CANVAS_WIDTH, CANVAS_HEIGHT)
 
         # Рисуем сетку
         self.draw_grid()
 
     def draw_grid(self):
-        """Рисует сетку в один пиксель."""
-        width, height = 600, 400
-        for x in range(0, width, 1):
-            self.canvas.create_line(x, 0, x, height, fill="#f0f0f0")  # Очень светло-серые линии
-        for y in range(0, height, 1):
-            self.canvas.create_line(0, y, width, y, fill="#f0f0f0")
+        """Рисует сетку в один пиксель как фон буфера кадра (готовое изображение из кэша)."""
+        self.framebuffer.set_background(grid_image(self.framebuffer.width, self.framebuffer.height, GRID_STEP))
+        self.framebuffer.flush()
+
+    def export_image(self):
+        """Сохраняет содержимое буфера кадра в файл PNG или PPM."""
+        path = filedialog.asksaveasfilename(
+            parent=self.root, title="Экспорт изображения", defaultextension=".png",
+            filetypes=[("PNG", "*.png"), ("PPM", "*.ppm")])
+        if not path:
+            return
+        try:
+            save_image(path, self.framebuffer.pixels)
+        except OSError as error:
+            messagebox.showerror("Экспорт", f"Не удалось сохранить файл:\n{error}", parent=self.root)
 
     def on_mouse_down(self, event):
         self.start_x = event.x
         self.start_y = event.y
+        self.reset_debug_line()  # Перемотка предыдущей отладочной линии вернула бы буфер к старому снимку
+        self.drag_base = self.framebuffer.snapshot()
+        self.preview_rect = None
 
     def on_mouse_drag(self, event):
-        pass  # Можно добавить предварительное отображение линии
+        """Показывает отрезок во время перетаскивания, обновляя только его окрестность."""
+        if self.drag_base is None:
+            return
+        self.erase_preview()
+        segment = (self.start_x, self.start_y, event.x, event.y)
+        xs, ys, levels = self.rasterize_segment(self.algorithm_var.get(), segment, self.current_width())
+        if len(xs):
+            self.framebuffer.put_levels(xs, ys, levels)
+            self.preview_rect = (max(xs.min(), 0), max(ys.min(), 0), xs.max() + 1, ys.max() + 1)
+        self.framebuffer.schedule_flush()
+
+    def erase_preview(self):
+        """Стирает предварительный отрезок, восстанавливая его прямоугольник из снимка."""
+        if self.preview_rect is not None:
+            self.framebuffer.restore_region(self.drag_base, self.preview_rect)
+            self.preview_rect = None
 
     def on_mouse_up(self, event):
         self.end_x = event.x
         self.end_y = event.y
+        self.erase_preview()
+        self.drag_base = None
 
         # Очистить текущие шаги
-        self.steps = []
         self.current_step = 0
 
-        # Выбрать алгоритм
         algorithm = self.algorithm_var.get()
-        if algorithm == "ЦДА":
-            self.steps = self.generate_line_dda(self.start_x, self.start_y, self.end_x, self.end_y)
+        # Пошаговое построение показывает сам алгоритм, поэтому в отладке линия тонкая
+        width = 1 if self.debug_mode.get() else self.current_width()
+        # Сцена хранит отрезок целиком: после увеличения окна он перерисуется с новой видимой частью
+        segment = Segment(self.start_x, self.start_y, self.end_x, self.end_y, algorithm, width)
+        self.scene.add(segment)
+
+        steps = self.visible_steps(segment.endpoints, width)
+        if steps is None:
+            return  # Отрезок целиком за пределами холста
+
+        if self.debug_mode.get():
+            # В отладочном режиме шаги вычисляются лениво, по мере выполнения
+            self.start_debug_line(LINE_STEPS[algorithm](*segment.endpoints, *steps))
+        elif width > 1 and algorithm not in ANTIALIASED:
+            # Толстая линия без сглаживания: серии пикселей поперёк линии Брезенхема
+            self.draw_line_runs(*thick_line_spans(*segment.endpoints, width, *steps))
         elif algorithm == "Брезенхем":
-            self.steps = self.generate_line_bresenham(self.start_x, self.start_y, self.end_x, self.end_y)
-        elif algorithm == "Ву":
-            self.steps = self.generate_line_wu(self.start_x, self.start_y, self.end_x, self.end_y)
-
-        # Если отладочный режим выключен, рисуем всю линию сразу
-        if not self.debug_mode.get():
-            self.draw_entire_line()
+            # Брезенхем рисуется сериями пикселей: одна операция с буфером на серию.
+            # Пиксели для кэша сцены посчитаются только при первой полной перерисовке.
+            self.draw_line_runs(*bresenham_runs(*segment.endpoints, *steps))
         else:
-            # Включаем кнопку "Шаг" в отладочном режиме
-            self.step_button.config(state=tk.NORMAL)
-
-    def draw_entire_line(self):
+            # Отладочный режим выключен, рисуем всю линию сразу
+            self.draw_entire_line(segment)
+
+    def current_width(self):
+        """Толщина линии из панели инструментов (некорректный ввод считается толщиной 1)."""
+        try:
+            width = self.line_width.get()
+        except tk.TclError:
+            return 1
+        return min(max(width, 1), MAX_LINE_WIDTH)
+
+    def visible_steps(self, segment, width=1):
+        """
+        Диапазон шагов (first, last) отрезка, видимых при текущем размере буфера кадра, или None:
+        работа зависит только от видимой длины, а пиксели те же, что у целого отрезка.
+        Толстые линии отсекаются с запасом на толщину, чтобы их концы не обрывались по краю холста.
+        """
+        margin = width if width > 1 else 0
+        return clip_line(*segment, -margin, -margin,
+                         self.framebuffer.width - 1 + margin, self.framebuffer.height - 1 + margin)
+
+    def rasterize_segment(self, algorithm, segment, width=1):
+        """Пиксели видимой части отрезка выбранным алгоритмом: массивы x, y и интенсивностей 0..255."""
+        steps = self.visible_steps(segment, width)
+        if steps is None:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, np.empty(0, dtype=np.uint8)
+        if width > 1:
+            # Толстые линии: сглаженные строятся по покрытию, остальные — по Брезенхему
+            return (thick_line_aa if algorithm in ANTIALIASED else thick_line)(*segment, width, *steps)
+        if algorithm in PATTERNS:
+            # Целочисленные алгоритмы: готовый узор по (dx, dy), сдвинутый в начало отрезка
+            return rasterize_line(algorithm, *segment, *steps)
+        generate = {
+            "ЦДА": generate_line_dda,
+            "Ву": generate_line_wu,
+        }[algorithm]
+        xs, ys, brightness = np.array(generate(*segment, *steps)).reshape(-1, 3).T
+        return xs.astype(np.int64), ys.astype(np.int64), np.rint(255 * brightness).astype(np.uint8)
+
+    def draw_entire_line(self, segment):
         """Рисует всю линию сразу."""
-        for step in self.steps:
-            x, y, brightness = step
-            self.draw_pixel_with_brightness(x, y, brightness)
+        self.framebuffer.put_levels(*self.scene.pixels_of(segment))
+        self.framebuffer.flush()  # Одна выгрузка изображения на линию
+
+    def draw_line_runs(self, steep, spans):
+        """Рисует линию, заданную горизонтальными или вертикальными сериями пикселей."""
+        self.framebuffer.put_spans(spans, steep)
+        self.framebuffer.flush()
+
+    def redraw_scene(self):
+        """Перерисовывает все отрезки сцены из кэша пикселей."""
+        self.reset_debug_line()
+        self.scene.redraw(self.framebuffer)
+        self.framebuffer.flush()
+
+    def undo(self, event=None):
+        """Отменяет последнее действие."""
+        if self.scene.undo():
+            self.redraw_scene()
+
+    def redo(self, event=None):
+        """Повторяет отменённое действие."""
+        if self.scene.redo():
+            self.redraw_scene()
+
+    def clear_canvas(self):
+        """Очищает холст (действие можно отменить)."""
+        self.scene.clear()
+        self.redraw_scene()
+
+    def on_canvas_resize(self, event):
+        """Подгоняет буфер кадра под новый размер холста и перерисовывает сцену."""
+        # Размер события включает рамку и подсветку фокуса холста
+        border = 2 * (int(self.canvas["borderwidth"]) + int(self.canvas["highlightthickness"]))
+        width, height = event.width - border, event.height - border
+        if width <= 0 or height <= 0 or (width, height) == (self.framebuffer.width, self.framebuffer.height):
+            return
+        self.framebuffer.resize(width, height)
+        self.scene.invalidate()  # Видимые части отрезков изменились
+        self.draw_grid()
+        self.redraw_scene()
+
+    def update_gamma(self):
+        """Включает или выключает гамма-коррекцию и перерисовывает сцену."""
+        self.framebuffer.set_gamma(GAMMA if self.gamma_enabled.get() else 1.0)
+        self.redraw_scene()
+
+    def reset_debug_line(self):
+        """Прекращает пошаговое построение текущей линии."""
+        self.stop_autoplay()
+        self.step_source = iter(())
+        self.trace_x = array("i")
+        self.trace_y = array("i")
+        self.trace_brightness = array("d")
+        self.line_base = None
+        self.current_step = 0
+        self.update_seek_scale()
+        self.set_debug_controls(tk.DISABLED)
+
+    def start_debug_line(self, steps):
+        """Готовит пошаговое построение линии по генератору шагов."""
+        self.step_source = steps
+        self.trace_x = array("i")
+        self.trace_y = array("i")
+        self.trace_brightness = array("d")
+        self.line_base = self.framebuffer.snapshot()
+        self.update_seek_scale()
+        self.set_debug_controls(tk.NORMAL)
+
+    def set_debug_controls(self, state):
+        """Включает или выключает кнопки шагов и ползунок перемотки."""
+        for widget in (self.step_button, self.run_count_spinbox, self.run_button,
+                       self.autoplay_button, self.seek_scale):
+            widget.config(state=state)
+
+    def advance_step(self):
+        """Рисует следующий шаг линии; возвращает False, если линия закончилась."""
+        if self.current_step < len(self.trace_x):
+            # После перемотки назад шаги повторяются из записи
+            x = self.trace_x[self.current_step]
+            y = self.trace_y[self.current_step]
+            brightness = self.trace_brightness[self.current_step]
+            details = ""
+        else:
+            step = next(self.step_source, None)
+            if step is None:
+                return False
+            x, y, brightness, state = step
+            self.trace_x.append(x)
+            self.trace_y.append(y)
+            self.trace_brightness.append(brightness)
+            details = f" ({format_state(state)})"
+
+        self.draw_pixel_with_brightness(x, y, brightness)
+        self.log_debug(f"Шаг {self.current_step}: Рисуем точку ({x}, {y}) с яркостью {brightness:.2f}{details}")
+        self.current_step += 1
+        return True
 
     def step_through_algorithm(self):
         """Выполняет один шаг алгоритма."""
-        if self.current_step < len(self.steps):
-            x, y, brightness = self.steps[self.current_step]
-            self.draw_pixel_with_brightness(x, y, brightness)
-            self.log_debug(f"Шаг {self.current_step}: Рисуем точку ({x}, {y}) с яркостью {brightness:.2f}")
-            self.current_step += 1
+        if not self.advance_step():
+            self.log_debug("Конец линии.")
+        self.update_seek_scale()
+
+    def run_steps(self):
+        """Выполняет N шагов подряд."""
+        try:
+            count = self.run_count.get()
+        except tk.TclError:
+            count = 1
+        for _ in range(count):
+            if not self.advance_step():
+                self.log_debug("Конец линии.")
+                break
+        self.update_seek_scale()
+
+    def toggle_autoplay(self):
+        """Запускает или приостанавливает автопроигрывание шагов."""
+        if self.autoplay_job is None:
+            self.autoplay_button.config(text="Пауза")
+            self.autoplay_tick()
+        else:
+            self.stop_autoplay()
+
+    def autoplay_tick(self):
+        """Выполняет один шаг и планирует следующий через after(), не блокируя интерфейс."""
+        self.autoplay_job = None
+        if self.advance_step():
+            self.update_seek_scale()
+            self.autoplay_job = self.root.after(AUTOPLAY_DELAY_MS, self.autoplay_tick)
         else:
             self.log_debug("Конец линии.")
+            self.stop_autoplay()
+
+    def stop_autoplay(self):
+        """Останавливает автопроигрывание."""
+        if self.autoplay_job is not None:
+            self.root.after_cancel(self.autoplay_job)
+            self.autoplay_job = None
+        self.autoplay_button.config(text="Авто")
+
+    def update_seek_scale(self):
+        """Подстраивает ползунок перемотки под число записанных шагов."""
+        self.seek_scale.config(to=len(self.trace_x))
+        self.seek_scale.set(self.current_step)
+
+    def seek_step(self, value):
+        """Показывает линию такой, какой она была после заданного числа шагов."""
+        target = min(int(float(value)), len(self.trace_x))
+        if self.line_base is None or target == self.current_step:
+            return
+        self.framebuffer.restore(self.line_base)
+        self.framebuffer.put_pixels(self.trace_x[:target], self.trace_y[:target], self.trace_brightness[:target])
+        self.framebuffer.schedule_flush()
+        self.current_step = target
 
     def draw_pixel_with_brightness(self, x, y, brightness):
         """Рисует пиксель с заданной яркостью."""
-        color = f"#{int(255 * brightness):02x}{int(255 * brightness):02x}{int(255 * brightness):02x}"
-        self.canvas.create_oval(x, y, x + 1, y + 1, fill=color)
+        self.framebuffer.put_pixels([x], [y], [brightness])
+        self.framebuffer.schedule_flush()  # Несколько шагов подряд дают одну выгрузку за кадр
 
     def log_debug(self, message):
         """Добавляет сообщение в текстовое поле для отладки."""
@@ -128,38 +422,25 @@ class LineEditorApp:
         self.debug_text.config(state=tk.DISABLED)  # Заблокировать текстовое поле снова
 
     def update_magnifier(self, event):
-        """Обновляет лупу при движении мыши."""
+        """Запоминает положение курсора; сама лупа перерисовывается не чаще раза за кадр."""
+        self.magnifier_pos = (event.x, event.y)
+        if self.magnifier_job is None:
+            self.magnifier_job = self.root.after(MAGNIFIER_FRAME_MS, self.render_magnifier)
+
+    def render_magnifier(self):
+        """Показывает увеличенную область буфера кадра вокруг последнего положения курсора."""
+        self.magnifier_job = None
         if self.magnifier_window is None or not self.magnifier_window.winfo_exists():
             self.create_magnifier_window()
 
-        # Получаем координаты курсора
-        x, y = event.x, event.y
-
-        # Ограничиваем область, чтобы не выходить за границы холста
-        x_min = max(0, x - self.magnifier_size // (2 * self.magnification_factor))
-        y_min = max(0, y - self.magnifier_size // (2 * self.magnification_factor))
-        x_max = min(600, x + self.magnifier_size // (2 * self.magnification_factor))
-        y_max = min(400, y + self.magnifier_size // (2 * self.magnification_factor))
-
-        # Очищаем лупу
-        self.magnifier_canvas.delete("all")
-
-        # Рисуем увеличенную область
-        for px in range(x_min, x_max):
-            for py in range(y_min, y_max):
-                # Получаем цвет пикселя
-                color = self.canvas.itemcget(self.canvas.find_closest(px, py), "fill")
-                if not color:
-                    color = "white"  # Если пиксель не найден, используем белый цвет
-
-                # Рисуем увеличенный пиксель
-                mx = (px - x_min) * self.magnification_factor
-                my = (py - y_min) * self.magnification_factor
-                self.magnifier_canvas.create_rectangle(
-                    mx, my,
-                    mx + self.magnification_factor, my + self.magnification_factor,
-                    fill=color, outline=""
-                )
+        # Область холста под лупой; пиксели за границами холста считаются белыми
+        x, y = self.magnifier_pos
+        cells = self.magnifier_size // self.magnification_factor
+        region = self.framebuffer.crop(x - cells // 2, y - cells // 2, cells, cells)
+
+        # Каждый пиксель становится квадратом magnification_factor x magnification_factor
+        zoomed = region.repeat(self.magnification_factor, axis=0).repeat(self.magnification_factor, axis=1)
+        upload(self.magnifier_image, zoomed)
 
     def create_magnifier_window(self):
         """Создает окно лупы."""
@@ -168,99 +449,8 @@ class LineEditorApp:
         self.magnifier_window.geometry(f"{self.magnifier_size}x{self.magnifier_size}")
         self.magnifier_canvas = tk.Canvas(self.magnifier_window, width=self.magnifier_size, height=self.magnifier_size)
         self.magnifier_canvas.pack()
-
-    # Алгоритм ЦДА
-    def generate_line_dda(self, x1, y1, x2, y2):
-        steps_list = []
-        dx = x2 - x1
-        dy = y2 - y1
-        steps = max(abs(dx), abs(dy))
-        if steps == 0:
-            return [(x1, y1, 1)]
-        x_increment = dx / steps
-        y_increment = dy / steps
-        x, y = x1, y1
-        for _ in range(steps + 1):
-            steps_list.append((round(x), round(y), 1))
-            x += x_increment
-            y += y_increment
-        return steps_list
-
-    # Целочисленный алгоритм Брезенхема
-    def generate_line_bresenham(self, x1, y1, x2, y2):
-        steps_list = []
-        dx = abs(x2 - x1)
-        dy = abs(y2 - y1)
-        sx = 1 if x1 < x2 else -1
-        sy = 1 if y1 < y2 else -1
-        err = dx - dy
-
-        while True:
-            steps_list.append((x1, y1, 1))
-            if x1 == x2 and y1 == y2:
-                break
-            e2 = 2 * err
-            if e2 > -dy:
-                err -= dy
-                x1 += sx
-            if e2 < dx:
-                err += dx
-                y1 += sy
-        return steps_list
-
-    # Алгоритм Ву
-    def generate_line_wu(self, x1, y1, x2, y2):
-        steps_list = []
-        dx = abs(x2 - x1)
-        dy = abs(y2 - y1)
-        steep = dy > dx
-
-        if steep:
-            x1, y1 = y1, x1
-            x2, y2 = y2, x2
-        if x1 > x2:
-            x1, x2 = x2, x1
-            y1, y2 = y2, y1
-
-        dx = x2 - x1
-        dy = y2 - y1
-        gradient = dy / dx if dx != 0 else 1
-
-        xend = round(x1)
-        yend = y1 + gradient * (xend - x1)
-        xgap = 1 - (x1 + 0.5) % 1
-        xpxl1 = xend
-        ypxl1 = int(yend)
-        if steep:
-            steps_list.append((ypxl1, xpxl1, 1 - (yend - int(yend))))
-            steps_list.append((ypxl1 + 1, xpxl1, yend - int(yend)))
-        else:
-            steps_list.append((xpxl1, ypxl1, 1 - (yend - int(yend))))
-            steps_list.append((xpxl1, ypxl1 + 1, yend - int(yend)))
-
-        intery = yend + gradient
-
-        xend = round(x2)
-        yend = y2 + gradient * (xend - x2)
-        xgap = (x2 + 0.5) % 1
-        xpxl2 = xend
-        ypxl2 = int(yend)
-        if steep:
-            steps_list.append((ypxl2, xpxl2, 1 - (yend - int(yend))))
-            steps_list.append((ypxl2 + 1, xpxl2, yend - int(yend)))
-        else:
-            steps_list.append((xpxl2, ypxl2, 1 - (yend - int(yend))))
-            steps_list.append((xpxl2, ypxl2 + 1, yend - int(yend)))
-
-        for x in range(xpxl1 + 1, xpxl2):
-            if steep:
-                steps_list.append((int(intery), x, 1 - (intery - int(intery))))
-                steps_list.append((int(intery) + 1, x, intery - int(intery)))
-            else:
-                steps_list.append((x, int(intery), 1 - (intery - int(intery))))
-                steps_list.append((x, int(intery) + 1, intery - int(intery)))
-            intery += gradient
-        return steps_list
+        self.magnifier_image = tk.PhotoImage(master=self.magnifier_canvas, width=self.magnifier_size, height=self.magnifier_size)
+        self.magnifier_canvas.create_image(0, 0, image=self.magnifier_image, anchor=tk.NW)
 
 
 # Запуск приложения
@@ -0,0 +1,97 @@
+"""
+Сцена графического редактора: список нарисованных отрезков.
+
+Для каждого отрезка хранятся концы и алгоритм, а его пиксели вычисляются
+один раз и кэшируются до смены размера холста. Полная перерисовка (после отмены,
+очистки, смены размера холста) — это одна массовая запись всех кэшированных
+пикселей в буфер.
+"""
+import numpy as np
+
+
+class Segment:
+    """Отрезок сцены с кэшем пикселей."""
+
+    def __init__(self, x1, y1, x2, y2, algorithm, width=1):
+        self.x1, self.y1, self.x2, self.y2 = x1, y1, x2, y2
+        self.algorithm = algorithm
+        self.width = width  # Толщина линии в пикселях
+        self.pixels = None  # (xs, ys, интенсивности 0..255), заполняется при первой растеризации
+
+    @property
+    def endpoints(self):
+        return self.x1, self.y1, self.x2, self.y2
+
+
+class Scene:
+    """Отрезки с отменой и повтором действий."""
+
+    def __init__(self, rasterize):
+        # rasterize(algorithm, (x1, y1, x2, y2), width) -> (xs, ys, levels)
+        self.rasterize = rasterize
+        self.segments = []
+        self.undo_stack = []  # Действия ("add", [отрезок]) или ("clear", [отрезки])
+        self.redo_stack = []
+
+    def pixels_of(self, segment):
+        """Пиксели отрезка из кэша (растеризуются при первом обращении)."""
+        if segment.pixels is None:
+            segment.pixels = self.rasterize(segment.algorithm, segment.endpoints, segment.width)
+        return segment.pixels
+
+    def pixels(self):
+        """Пиксели всех отрезков сцены одним набором массивов."""
+        if not self.segments:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, np.empty(0, dtype=np.uint8)
+        parts = [self.pixels_of(segment) for segment in self.segments]
+        return tuple(np.concatenate(arrays) for arrays in zip(*parts))
+
+    def invalidate(self):
+        """Сбрасывает кэш пикселей всех отрезков, в том числе отменённых (например, после смены размера холста)."""
+        for _, segments in self.undo_stack + self.redo_stack:
+            for segment in segments:
+                segment.pixels = None
+        for segment in self.segments:
+            segment.pixels = None
+
+    def add(self, segment):
+        self.segments.append(segment)
+        self.undo_stack.append(("add", [segment]))
+        self.redo_stack.clear()
+
+    def clear(self):
+        if self.segments:
+            self.undo_stack.append(("clear", self.segments))
+            self.redo_stack.clear()
+            self.segments = []
+
+    def undo(self):
+        """Отменяет последнее действие; возвращает False, если отменять нечего."""
+        if not self.undo_stack:
+            return False
+        action, segments = self.undo_stack.pop()
+        if action == "add":
+            self.segments.pop()
+        else:
+            self.segments = list(segments)
+        self.redo_stack.append((action, segments))
+        return True
+
+    def redo(self):
+        """Повторяет отменённое действие; возвращает False, если повторять нечего."""
+        if not self.redo_stack:
+            return False
+        action, segments = self.redo_stack.pop()
+        if action == "add":
+            self.segments.extend(segments)
+        else:
+            self.segments = []
+        self.undo_stack.append((action, segments))
+        return True
+
+    def redraw(self, framebuffer):
+        """Перерисовывает буфер кадра: фон и все кэшированные пиксели за одну запись."""
+        framebuffer.clear()
+        xs, ys, levels = self.pixels()
+        framebuffer.put_levels(xs, ys, levels)
@@ -0,0 +1,111 @@
+"""
+Толстые отрезки.
+
+Без сглаживания отрезок строится по линии Брезенхема: в каждой её точке
+ставится серия пикселей поперёк главной оси, длина которой даёт нужную
+толщину перпендикулярно отрезку. Со сглаживанием покрытие каждого пикселя
+считается по расстоянию от его центра до оси отрезка (край шириной в один
+пиксель, как у Ву), а вычисления идут сразу для всех пикселей вдоль линии.
+"""
+import math
+
+import numpy as np
+
+from line_patterns import rasterize_line
+
+
+def _spine(x1, y1, x2, y2, width, first=0, last=None):
+    """
+    Ось отрезка по Брезенхему (шаги first..last, см. line_algorithms.clip_line) и длина
+    серии поперёк главной оси: (steep, xs, ys, lo, hi).
+    """
+    dx = abs(x2 - x1)
+    dy = abs(y2 - y1)
+    major = max(dx, dy)
+    if major == 0:
+        # Точка: квадрат width x width — горизонтальная ось из width пикселей с вертикальными сериями
+        lo = (width - 1) // 2
+        return False, x1 + np.arange(-lo, width - lo), np.full(width, y1), lo, width - 1 - lo
+    # Вдоль второстепенной оси толщина width занимает width * длина / major пикселей
+    count = max(1, round(width * math.hypot(dx, dy) / major))
+    lo = (count - 1) // 2
+    xs, ys, _ = rasterize_line("Брезенхем", x1, y1, x2, y2, first, last)
+    return dy > dx, xs, ys, lo, count - 1 - lo
+
+
+def thick_line_spans(x1, y1, x2, y2, width, first=0, last=None):
+    """
+    Серии пикселей толстого отрезка без сглаживания.
+    Возвращает (vertical, spans) в формате FrameBuffer.put_spans.
+    """
+    steep, xs, ys, lo, hi = _spine(x1, y1, x2, y2, width, first, last)
+    xs, ys = xs.tolist(), ys.tolist()
+    if steep:
+        # Крутой отрезок: горизонтальные серии (x_min, x_max, y)
+        return False, [(x - lo, x + hi, y) for x, y in zip(xs, ys)]
+    return True, [(x, y - lo, y + hi) for x, y in zip(xs, ys)]
+
+
+def thick_line(x1, y1, x2, y2, width, first=0, last=None):
+    """Пиксели толстого отрезка без сглаживания: массивы x, y и интенсивностей 0..255."""
+    steep, xs, ys, lo, hi = _spine(x1, y1, x2, y2, width, first, last)
+    offsets = np.arange(-lo, hi + 1)
+    xs = np.repeat(xs, len(offsets))
+    ys = np.repeat(ys, len(offsets))
+    if steep:
+        xs += np.tile(offsets, len(xs) // len(offsets))
+    else:
+        ys += np.tile(offsets, len(ys) // len(offsets))
+    return xs, ys, np.full(len(xs), 255, dtype=np.uint8)
+
+
+def thick_line_aa(x1, y1, x2, y2, width, first=0, last=None):
+    """
+    Сглаженный толстый отрезок: массивы x, y и интенсивностей 0..255.
+    Покрытие пикселя — clip(width / 2 + 0.5 - d, 0, 1), где d — расстояние от его центра
+    до оси; у концов отрезка (срез под прямым углом) оно так же спадает за полпикселя.
+    Отрезок нулевой длины даёт квадрат width x width с такими же краями. Диапазон шагов
+    first..last ограничивает столбцы вдоль главной оси (с запасом на толщину).
+    """
+    if x1 == x2 and y1 == y2:
+        reach = math.ceil(width / 2)
+        offsets = np.arange(-reach, reach + 1)
+        cover = np.clip(width / 2 + 0.5 - np.abs(offsets), 0, 1)
+        levels = np.rint(255 * np.outer(cover, cover)).astype(np.uint8)
+        rows, columns = np.nonzero(levels)
+        return x1 + offsets[columns], y1 + offsets[rows], levels[rows, columns]
+    steep = abs(y2 - y1) > abs(x2 - x1)
+    last = max(abs(x2 - x1), abs(y2 - y1)) if last is None else last
+    if steep:
+        x1, y1, x2, y2 = y1, x1, y2, x2
+    if x1 > x2:
+        x1, y1, x2, y2 = x2, y2, x1, y1
+        first, last = x2 - x1 - last, x2 - x1 - first
+    dx = x2 - x1
+    dy = y2 - y1
+    length = math.hypot(dx, dy)
+    ux, uy = dx / length, dy / length
+    half = width / 2
+
+    # Столбцы с запасом на срезы концов; в каждом столбце — окно вокруг оси
+    pad = math.ceil(half + 1)
+    columns = np.arange(x1 + first - pad, x1 + last + pad + 1)
+    center = np.floor(y1 + (columns - x1) * (dy / dx if dx else 0.0)).astype(np.int64)
+    reach = math.ceil((half + 1) / ux)
+    rows = center[:, None] + np.arange(-reach, reach + 1)
+
+    px = columns[:, None] - x1
+    py = rows - y1
+    along = px * ux + py * uy  # Положение проекции центра на оси
+    across = np.abs(py * ux - px * uy)  # Расстояние до оси
+    coverage = (np.clip(half + 0.5 - across, 0, 1)
+                * np.clip(np.minimum(along, length - along) + 0.5, 0, 1))
+    levels = np.rint(255 * coverage).astype(np.uint8)
+
+    inside = levels > 0
+    major = np.broadcast_to(columns[:, None], rows.shape)[inside]
+    minor = rows[inside]
+    levels = levels[inside]
+    if steep:
+        return minor, major, levels
+    return major, minor, levels
@@ -0,0 +1,116 @@
+"""
+Checks the NumPy batch rasterizer against the scalar midpoint code and compares their speed.
+
+Runs without opening a window. For random circles and ellipses it verifies that
+curve_batch produces exactly the pixels (and pixel order) that
+draw_circle_midpoint / draw_ellipse_midpoint plot, then times both.
+
+Examples:
+    python benchmark.py
+    python benchmark.py --count 5000 --max-radius 50 --repeat 5
+"""
+import argparse
+import math
+import random
+import time
+
+import numpy as np
+
+from curve_batch import rasterize_circles, rasterize_ellipses
+from main import CANVAS_HEIGHT, CANVAS_WIDTH, CurveDrawer, draw_circle_midpoint, draw_ellipse_midpoint
+
+
+class RecordingDrawer(CurveDrawer):
+    """CurveDrawer that records plotted pixels instead of drawing them."""
+    def __init__(self):
+        self.debug_active = False
+        self.xs = []
+        self.ys = []
+        self.curve = []
+        self.index = 0 # Номер текущей кривой
+
+    def plot_pixel(self, center_x, center_y, x, y, color="black", step_info="", intensity=None):
+        self.xs.append(center_x + x)
+        self.ys.append(center_y + y)
+        self.curve.append(self.index)
+
+
+def random_curves(count, min_radius=1, max_radius=200, seed=0):
+    """Random centres on the canvas with radii (rx, ry) in the given range."""
+    rng = random.Random(seed)
+    centers = [(rng.randrange(CANVAS_WIDTH), rng.randrange(CANVAS_HEIGHT)) for _ in range(count)]
+    radii = [(rng.randint(min_radius, max_radius), rng.randint(min_radius, max_radius)) for _ in range(count)]
+    return np.array(centers, dtype=np.int64), np.array(radii, dtype=np.int64)
+
+
+def scalar_circles(centers, radii):
+    drawer = RecordingDrawer()
+    for index, ((xc, yc), r) in enumerate(zip(centers.tolist(), radii.tolist())):
+        drawer.index = index
+        for _ in draw_circle_midpoint(drawer, xc, yc, r):
+            pass
+    return drawer
+
+
+def scalar_ellipses(centers, radii):
+    drawer = RecordingDrawer()
+    for index, ((xc, yc), (rx, ry)) in enumerate(zip(centers.tolist(), radii.tolist())):
+        drawer.index = index
+        for _ in draw_ellipse_midpoint(drawer, xc, yc, rx, ry):
+            pass
+    return drawer
+
+
+def check(name, scalar, batch):
+    """Raises AssertionError if the batch output differs from the scalar one."""
+    for field in ("xs", "ys", "curve"):
+        expected = np.array(getattr(scalar, field), dtype=np.int64)
+        actual = getattr(batch, {"xs": "x", "ys": "y", "curve": "curve"}[field])
+        if expected.shape != actual.shape or not np.array_equal(expected, actual):
+            raise AssertionError(f"{name}: batch output differs from the scalar code ({field})")
+
+
+def best_time(run, repeat):
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Validate and benchmark batch circle/ellipse rasterization.")
+    parser.add_argument("--count", type=int, default=2000, help="number of curves")
+    parser.add_argument("--min-radius", type=int, default=1, help="smallest radius")
+    parser.add_argument("--max-radius", type=int, default=200, help="largest radius")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement (best time is reported)")
+    args = parser.parse_args(argv)
+    if args.count < 1 or args.repeat < 1:
+        parser.error("--count and --repeat must be positive")
+    if not 0 <= args.min_radius <= args.max_radius:
+        parser.error("radii must satisfy 0 <= --min-radius <= --max-radius")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    centers, radii = random_curves(args.count, args.min_radius, args.max_radius, args.seed)
+
+    cases = [
+        ("circles", lambda: scalar_circles(centers, radii[:, 0]), lambda: rasterize_circles(centers, radii[:, 0])),
+        ("ellipses", lambda: scalar_ellipses(centers, radii), lambda: rasterize_ellipses(centers, radii)),
+    ]
+    print(f"{args.count} curves, radius {args.min_radius}..{args.max_radius}")
+    for name, scalar, batch in cases:
+        result = batch()
+        check(name, scalar(), result)
+        scalar_time = best_time(scalar, args.repeat)
+        batch_time = best_time(batch, args.repeat)
+        print(f"{name:>9}: {len(result.x)} pixels, identical; scalar {scalar_time * 1000:8.1f} ms, "
+              f"NumPy {batch_time * 1000:8.1f} ms ({scalar_time / batch_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
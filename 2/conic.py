@@ -0,0 +1,295 @@
+"""
+General conic rasterizer for A x^2 + B xy + C y^2 + D x + E y + F = 0.
+
+The curve is tracked pixel by pixel from a starting point. At every step the
+gradient of the implicit function picks the octant (which axis is the major
+one and which way the diagonal goes), and the sign of the function at the
+midpoint between the straight and the diagonal candidate picks the step.
+Ellipses are traced differently: on a thin one the gradient at a pixel near a
+tip may belong to the other side, so the step signs follow the monotone arcs
+between the extreme points instead.
+
+All arithmetic is integer. The function is evaluated at doubled coordinates
+(X = 2x, Y = 2y) so that half-pixel midpoints are integer points, and its value
+and gradient are carried from pixel to pixel with exact second-order updates
+(the Hessian of a conic is constant).
+
+Coordinates are relative to the curve's origin (its centre or vertex), with y
+pointing down as on the canvas. Coefficient builders below turn geometric
+parameters into integer coefficients.
+"""
+import math
+
+# Коэффициенты из cos/sin масштабируются и округляются до целых
+COEFFICIENT_SCALE = 1 << 16
+
+MAX_STEPS = 100000 # Safety limit for a single tracking run
+
+
+def _integer(coefficients):
+    return tuple(round(c * COEFFICIENT_SCALE) for c in coefficients)
+
+
+def ellipse_coefficients(a, b, angle):
+    """Ellipse with semi-axes a (along the direction `angle`, radians) and b, centred at the origin."""
+    c, s = math.cos(angle), math.sin(angle)
+    a2, b2 = a * a, b * b
+    return _integer((b2 * c * c + a2 * s * s, 2 * c * s * (b2 - a2), b2 * s * s + a2 * c * c,
+                     0, 0, -a2 * b2))
+
+
+def hyperbola_coefficients(a, b, angle):
+    """Hyperbola t^2/a^2 - w^2/b^2 = 1 whose transverse axis t points along `angle`, centred at the origin."""
+    c, s = math.cos(angle), math.sin(angle)
+    a2, b2 = a * a, b * b
+    return _integer((b2 * c * c - a2 * s * s, 2 * c * s * (a2 + b2), b2 * s * s - a2 * c * c,
+                     0, 0, -a2 * b2))
+
+
+def parabola_coefficients(p, angle):
+    """Parabola w^2 = 4pt with the vertex at the origin, opening along `angle` (towards the focus at distance p)."""
+    c, s = math.cos(angle), math.sin(angle)
+    return _integer((s * s, -2 * c * s, c * c, -4 * p * c, -4 * p * s, 0))
+
+
+def _sign(value):
+    return (value > 0) - (value < 0)
+
+
+def _step_value(coefficients, g, gx, gy, u, v):
+    """G after the step (u, v) in doubled coordinates, from its value g and gradient (gx, gy) before it."""
+    A, B, C = coefficients[:3]
+    return g + u * gx + v * gy + A * u * u + B * u * v + C * v * v
+
+
+def trace_conic(coefficients, start, direction=1, bounds=None, closed=False, max_steps=MAX_STEPS):
+    """
+    Yields the pixels (x, y) that follow `start` along the conic.
+
+    direction (+1 or -1) chooses which way along the curve to go. closed=True traces an
+    ellipse centred at the origin from one of its vertices once around (_trace_ellipse).
+    With bounds = (x_min, y_min, x_max, y_max) tracking stops as soon as the branch can no
+    longer come back into them: tracked from its vertex, a parabola or hyperbola branch
+    turns monotonically from the current tangent towards its asymptotic direction, so the
+    rest of it lies in the angle between the two (_cannot_return). Tracking also stops at
+    a singular point (zero gradient) and after max_steps steps.
+    """
+    if closed:
+        yield from _trace_ellipse(coefficients, start, direction, max_steps)
+        return
+    A, B, C, D, E, F = coefficients
+    x, y = start
+    X, Y = 2 * x, 2 * y
+    # Значение и градиент функции G(X, Y) = 4 * f(X / 2, Y / 2) в текущем пикселе
+    g = A * X * X + B * X * Y + C * Y * Y + 2 * D * X + 2 * E * Y + 4 * F
+    gx = 2 * A * X + B * Y + 2 * D
+    gy = B * X + 2 * C * Y + 2 * E
+
+    if bounds is not None:
+        limit = _limit_direction(coefficients, -direction * gy, direction * gx, direction)
+    previous = None
+
+    for _ in range(max_steps):
+        if gx == 0 and gy == 0:
+            return # Особая точка: направление касательной не определено
+
+        # Касательная (-gy, gx) задаёт октант: главную ось и направление диагонального шага
+        tx, ty = -direction * gy, direction * gx
+        sx, sy = _sign(tx), _sign(ty)
+        if abs(tx) >= abs(ty):
+            # Главная ось x: выбор между (sx, 0) и (sx, sy), середина (sx, sy / 2)
+            if sy == 0:
+                sy = -_sign(g + 2 * sx * gx + 4 * A) * _sign(gy) or 1 # Кривая касается горизонтали
+            u, v = 2 * sx, sy
+            mid = g + u * gx + v * gy + A * u * u + B * u * v + C * v * v
+            diagonal = mid * gy * sy < 0 # Середина по ту же сторону, что и прямой шаг
+            if (x + sx, y + (sy if diagonal else 0)) == previous:
+                diagonal = not diagonal # Острый конец кривой: не возвращаться назад
+            v = 2 * sy if diagonal else 0
+        else:
+            # Главная ось y: выбор между (0, sy) и (sx, sy), середина (sx / 2, sy)
+            if sx == 0:
+                sx = -_sign(g + 2 * sy * gy + 4 * C) * _sign(gx) or 1 # Кривая касается вертикали
+            u, v = sx, 2 * sy
+            mid = g + u * gx + v * gy + A * u * u + B * u * v + C * v * v
+            diagonal = mid * gx * sx < 0
+            if (x + (sx if diagonal else 0), y + sy) == previous:
+                diagonal = not diagonal
+            u = 2 * sx if diagonal else 0
+
+        # Точное обновление значения и градиента (гессиан постоянный)
+        g += u * gx + v * gy + A * u * u + B * u * v + C * v * v
+        gx += 2 * A * u + B * v
+        gy += B * u + 2 * C * v
+        previous = (x, y)
+        x += u // 2
+        y += v // 2
+        yield x, y
+
+        if bounds is not None and _cannot_return(bounds, x, y, (-direction * gy, direction * gx), limit):
+            return
+
+
+def _limit_direction(coefficients, tx, ty, direction):
+    """
+    Direction the tangent (tx, ty) of an open branch turns towards and approaches at infinity.
+
+    That is the asymptote (or, for a parabola, the axis) direction Q(d) = A dx^2 + B dx dy +
+    C dy^2 = 0 first reached when turning from the tangent the way the curve bends.
+    """
+    A, B, C = coefficients[:3]
+    turn = _sign(direction * (A * tx * tx + B * tx * ty + C * ty * ty))
+    if turn == 0:
+        return tx, ty # Прямая: касательная не поворачивается
+    # Округление коэффициентов параболы может дать слегка отрицательный дискриминант
+    root = math.sqrt(max(B * B - 4 * A * C, 0))
+    if A != 0:
+        roots = ((-B + root, 2 * A), (-B - root, 2 * A))
+    else:
+        roots = ((1, 0), (C, -B))
+    # Ось параболы в вершине перпендикулярна касательной, поэтому выбор только по стороне поворота
+    best, best_cos = (tx, ty), -2.0
+    for dx, dy in roots:
+        for dx, dy in ((dx, dy), (-dx, -dy)):
+            cos = (tx * dx + ty * dy) / math.hypot(dx, dy) / math.hypot(tx, ty)
+            if turn * (tx * dy - ty * dx) > 0 and cos > best_cos:
+                best, best_cos = (dx, dy), cos
+    return best
+
+
+def _cannot_return(bounds, x, y, tangent, limit):
+    """
+    True when the bounds and the angle from (x, y) between `tangent` and `limit` are disjoint.
+
+    Both are convex, so it is enough to look for a separating line among the bounds' sides
+    and the two sides of the angle. The bounds are widened by a pixel, since (x, y) and
+    its tangent are only a pixel away from the curve.
+    """
+    x_min, y_min, x_max, y_max = bounds
+    x_min, y_min, x_max, y_max = x_min - 1, y_min - 1, x_max + 1, y_max + 1
+    directions = (tangent, limit)
+    # Вся ветвь дальше за одной из сторон границ и уходит от неё
+    if x > x_max and all(dx >= 0 for dx, _ in directions) or x < x_min and all(dx <= 0 for dx, _ in directions):
+        return True
+    if y > y_max and all(dy >= 0 for _, dy in directions) or y < y_min and all(dy <= 0 for _, dy in directions):
+        return True
+    # Все углы границ по другую сторону одного из лучей, чем ветвь
+    corners = ((x_min, y_min), (x_max, y_min), (x_min, y_max), (x_max, y_max))
+    for (ex, ey), (ox, oy) in ((tangent, limit), (limit, tangent)):
+        inner = _sign(ex * oy - ey * ox) # Сторона луча, где лежит ветвь (0: угол вырожден в луч)
+        sides = {_sign(ex * (cy - y) - ey * (cx - x)) for cx, cy in corners}
+        if len(sides) == 1 and 0 != sides.pop() != inner:
+            return True
+    # Все углы позади (нужно, когда угол вырожден в луч)
+    return all(tangent[0] * (cx - x) + tangent[1] * (cy - y) < 0 for cx, cy in corners)
+
+
+def _trace_ellipse(coefficients, start, direction, max_steps):
+    """
+    Yields the pixels that follow the vertex `start` once around the ellipse A x^2 + B xy + C y^2 + F = 0.
+
+    Near the tips of a thin ellipse both sides fall inside one pixel, and the gradient at
+    a pixel may belong to either of them, so neither the step signs nor the side of the
+    curve are taken from it. The walk keeps the signs (sx, sy) of the monotone arc it is
+    on and turns them at the arc's end point (see _turn_arc); the outside of the ellipse
+    is always on the same side of the walk (see _ellipse_step). Tracking stops when the
+    angle around the centre, counted from the start, has passed three quarters and
+    comes back to zero.
+    """
+    A, B, C, D, E, F = coefficients
+    K = 4 * A * C - B * B
+    x, y = start
+    X, Y = 2 * x, 2 * y
+    g = A * X * X + B * X * Y + C * Y * Y + 4 * F
+    gx = 2 * A * X + B * Y
+    gy = B * X + 2 * C * Y
+    # В вершине касательная перпендикулярна радиусу; нулевую составляющую уточняет градиент
+    sx = _sign(-direction * y) or _sign(-direction * gy) or 1
+    sy = _sign(direction * x) or _sign(direction * gx) or 1
+    third_quarter = False
+
+    for _ in range(max_steps):
+        sx, sy = _turn_arc(coefficients, K, x, y, sx, sy, direction, 1)
+        step = _ellipse_step(coefficients, g, gx, gy, sx, sy, direction)
+        if step is None and _nearest_step(coefficients, g, gx, gy, sx, sy)[0] >= g:
+            # Все кандидаты снаружи и дальше от кривой: у острого конца ход проскочил крайнюю точку
+            sx, sy = _turn_arc(coefficients, K, x, y, sx, sy, direction, 3)
+            step = _ellipse_step(coefficients, g, gx, gy, sx, sy, direction)
+        if step is None:
+            step = _nearest_step(coefficients, g, gx, gy, sx, sy)[1]
+        u, v = step
+
+        g += u * gx + v * gy + A * u * u + B * u * v + C * v * v
+        gx += 2 * A * u + B * v
+        gy += B * u + 2 * C * v
+        x += u // 2
+        y += v // 2
+        yield x, y
+
+        # Четверть угла от начальной точки по знакам скалярного и векторного произведений
+        ahead = x * start[0] + y * start[1] >= 0
+        turned = direction * (start[0] * y - start[1] * x) >= 0
+        if not ahead and not turned:
+            third_quarter = True
+        elif third_quarter and ahead and turned:
+            return # Кривая замкнулась
+
+
+def _turn_arc(coefficients, K, x, y, sx, sy, direction, slack):
+    """
+    Returns the step signs for the walk at (x, y) on the arc (sx, sy) of the ellipse, with
+    K = 4AC - B^2.
+
+    Along any ellipse the extreme points come in the same order, so for the given
+    direction the arc (sx, sy) ends at the extreme point in x when direction * sx * sy > 0
+    and in y otherwise. Its sign turns once the walk is within slack / 2 pixels of that
+    point in both its column and its row: the extreme x is x_e = sqrt(-4CF / K), reached
+    at y = -B sx x_e / (2C) (and likewise for y), compared here through exact squares.
+    """
+    A, B, C, D, E, F = coefficients
+    if direction * sx * sy > 0:
+        column, level, limit = sx * 2 * x + slack, sy * 2 * C * y + slack * C, -16 * C * F
+    else:
+        column, level, limit = sy * 2 * y + slack, sx * 2 * A * x + slack * A, -16 * A * F
+    # limit = 4 e^2 K; столбец: column >= 2e, строка: level >= factor * e
+    factor = -sx * sy * B
+    if factor <= 0:
+        row = level >= 0 or 4 * level * level * K <= factor * factor * limit
+    else:
+        row = level > 0 and 4 * level * level * K >= factor * factor * limit
+    if not (row and column > 0 and column * column * K >= limit):
+        return sx, sy
+    return (-sx, sy) if direction * sx * sy > 0 else (sx, -sy)
+
+
+def _nearest_step(coefficients, g, gx, gy, sx, sy):
+    """The smallest G after a step along the arc (sx, sy), and that step."""
+    return min((_step_value(coefficients, g, gx, gy, u, v), (u, v))
+               for u, v in ((2 * sx, 0), (0, 2 * sy), (2 * sx, 2 * sy)))
+
+
+def _ellipse_step(coefficients, g, gx, gy, sx, sy, direction):
+    """
+    Picks the step (in doubled coordinates) along the arc (sx, sy), or None when all
+    three candidates lie outside the ellipse.
+
+    The outside is along the normal direction * (sy, -sx), so across the walk the
+    candidates go inner straight step, diagonal, outer straight step; the one next to
+    the crossing from inside to outside is taken, with the midpoint between the two
+    candidates around it deciding.
+    """
+    if direction * sx * sy > 0:
+        inner, outer = (0, 2 * sy), (2 * sx, 0)
+    else:
+        inner, outer = (2 * sx, 0), (0, 2 * sy)
+    diagonal = (2 * sx, 2 * sy)
+    g_inner, g_diagonal, g_outer = (_step_value(coefficients, g, gx, gy, u, v) for u, v in (inner, diagonal, outer))
+    if g_outer <= 0:
+        return outer
+    if g_diagonal <= 0:
+        middle = _step_value(coefficients, g, gx, gy, sx + outer[0] // 2, sy + outer[1] // 2)
+        return outer if middle < 0 else diagonal
+    if g_inner <= 0:
+        middle = _step_value(coefficients, g, gx, gy, sx + inner[0] // 2, sy + inner[1] // 2)
+        return diagonal if middle < 0 else inner
+    return None
@@ -0,0 +1,218 @@
+"""
+Batch rasterization of circles and ellipses with NumPy.
+
+Takes arrays of centres and radii and builds the pixels of all curves at once.
+The midpoint recurrences of draw_circle_midpoint / draw_ellipse_midpoint are
+run in lockstep for the whole batch (one vectorized update per algorithm step),
+so the output matches the scalar code pixel for pixel, including the order of
+pixels within each curve and the duplicated symmetric points on the axes.
+"""
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+# x, y and the index of the curve each pixel belongs to
+CurveBatch = namedtuple("CurveBatch", ["x", "y", "curve"])
+
+# Symmetric points in the order used by CurveDrawer.plot_circle_points / plot_ellipse_points
+CIRCLE_SYMMETRY = ((1, 1, False), (-1, 1, False), (1, -1, False), (-1, -1, False),
+                   (1, 1, True), (-1, 1, True), (1, -1, True), (-1, -1, True)) # (sign x, sign y, swap)
+ELLIPSE_SYMMETRY = ((1, 1, False), (-1, 1, False), (1, -1, False), (-1, -1, False))
+
+
+def as_centers(centers, count=None):
+    """Converts centres to an integer array of shape (N, 2)."""
+    centers = np.asarray(centers)
+    if centers.ndim == 1 and centers.size == 2:
+        centers = centers.reshape(1, 2)
+    if centers.ndim != 2 or centers.shape[1] != 2:
+        raise ValueError("Centers must be an array of shape (N, 2).")
+    if count is not None and len(centers) != count:
+        raise ValueError("Centers and radii must have the same length.")
+    if centers.size and not np.issubdtype(centers.dtype, np.integer):
+        raise ValueError("Centers must be integers.")
+    return centers.astype(np.int64, copy=False)
+
+
+def _as_integers(values, name):
+    values = np.asarray(values)
+    if values.size and not np.issubdtype(values.dtype, np.integer):
+        raise ValueError(f"{name} must be integers.")
+    return values.astype(np.int64, copy=False)
+
+
+class _StepRecorder:
+    """Collects per-curve step points (x, y) of a lockstep run into (N, steps) arrays."""
+    def __init__(self, count):
+        self.count = count
+        self.columns = [] # (x, y, valid) for every lockstep iteration
+
+    def record(self, x, y, valid):
+        self.columns.append((x.copy(), y.copy(), valid.copy()))
+
+    def arrays(self):
+        if not self.columns:
+            empty = np.empty((self.count, 0), dtype=np.int64)
+            return empty, empty, np.empty((self.count, 0), dtype=bool)
+        xs, ys, valid = zip(*self.columns)
+        return np.stack(xs, axis=1), np.stack(ys, axis=1), np.stack(valid, axis=1)
+
+
+def circle_steps(radii):
+    """Step points (x, y) of draw_circle_midpoint for every radius: arrays (N, steps) and a validity mask."""
+    r = _as_integers(radii, "Radii").ravel()
+    x = np.zeros_like(r)
+    y = r.copy()
+    p = 1 - r
+    recorder = _StepRecorder(len(r))
+    active = r >= 0 # Для r < 0 ничего не рисуется
+    recorder.record(x, y, active)
+
+    active = active & (x < y)
+    while active.any():
+        x = np.where(active, x + 1, x)
+        outside = active & (p >= 0)
+        y = np.where(outside, y - 1, y)
+        p = np.where(active, np.where(outside, p + 2 * (x - y) + 1, p + 2 * x + 1), p)
+        recorder.record(x, y, active)
+        active &= x < y
+    return recorder.arrays()
+
+
+def ellipse_steps(rx, ry):
+    """Step points (x, y) of draw_ellipse_midpoint for every pair of radii: arrays (N, steps) and a validity mask."""
+    rx = _as_integers(rx, "Radii").ravel()
+    ry = _as_integers(ry, "Radii").ravel()
+    rx2 = rx * rx
+    ry2 = ry * ry
+    two_rx2 = 2 * rx2
+    two_ry2 = 2 * ry2
+    recorder = _StepRecorder(len(rx))
+    active = (rx > 0) & (ry > 0)
+
+    # --- Region 1 ---
+    x = np.zeros_like(rx)
+    y = ry.copy()
+    # round() в Python и np.rint одинаково округляют половины к чётному
+    p = np.rint((ry2 - rx2 * ry) + 0.25 * rx2).astype(np.int64)
+    px = np.zeros_like(rx)
+    py = two_rx2 * y
+    recorder.record(x, y, active)
+
+    running = active & (px < py)
+    while running.any():
+        x = np.where(running, x + 1, x)
+        px = np.where(running, px + two_ry2, px)
+        inside = p < 0
+        step_y = running & ~inside
+        y = np.where(step_y, y - 1, y)
+        py = np.where(step_y, py - two_rx2, py)
+        p = np.where(running, np.where(inside, p + ry2 + px, p + ry2 + px - py), p)
+        recorder.record(x, y, running)
+        running &= px < py
+
+    # --- Region 2 ---
+    p = np.rint(ry2 * (x + 0.5) ** 2 + rx2 * (y - 1) ** 2 - rx2 * ry2).astype(np.int64)
+    running = active & (y >= 0)
+    while running.any():
+        y = np.where(running, y - 1, y)
+        py = np.where(running, py - two_rx2, py)
+        outside = p > 0
+        step_x = running & ~outside
+        x = np.where(step_x, x + 1, x)
+        px = np.where(step_x, px + two_ry2, px)
+        p = np.where(running, np.where(outside, p + rx2 - py, p + rx2 - py + px), p)
+        recorder.record(x, y, running)
+        running &= y >= 0
+    return recorder.arrays()
+
+
+def _expand(centers, xs, ys, valid, symmetry):
+    """Symmetric points of every valid step, absolute coordinates, in the scalar plotting order."""
+    # Маска по массиву (N, steps) сохраняет порядок: кривая -> шаг
+    curve = np.broadcast_to(np.arange(len(centers))[:, None], valid.shape)[valid]
+    xs = xs[valid]
+    ys = ys[valid]
+    points_x = np.empty((len(xs), len(symmetry)), dtype=np.int64)
+    points_y = np.empty_like(points_x)
+    for column, (sign_x, sign_y, swap) in enumerate(symmetry):
+        a, b = (ys, xs) if swap else (xs, ys)
+        points_x[:, column] = sign_x * a
+        points_y[:, column] = sign_y * b
+    # Строки (шаг, симметричная точка) подряд - как при поочерёдных вызовах plot_pixel
+    points_x += centers[curve, 0, None]
+    points_y += centers[curve, 1, None]
+    return CurveBatch(points_x.ravel(), points_y.ravel(), np.repeat(curve, len(symmetry)))
+
+
+def rasterize_circles(centers, radii):
+    """Midpoint circles for arrays of centres (N, 2) and radii (N,)."""
+    radii = _as_integers(radii, "Radii").ravel()
+    centers = as_centers(centers, len(radii))
+    xs, ys, valid = circle_steps(radii)
+    return _expand(centers, xs, ys, valid, CIRCLE_SYMMETRY)
+
+
+def rasterize_ellipses(centers, radii):
+    """Midpoint ellipses for arrays of centres (N, 2) and radii (N, 2) given as (rx, ry)."""
+    radii = _as_integers(radii, "Radii").reshape(-1, 2)
+    centers = as_centers(centers, len(radii))
+    xs, ys, valid = ellipse_steps(radii[:, 0], radii[:, 1])
+    return _expand(centers, xs, ys, valid, ELLIPSE_SYMMETRY)
+
+
+def _unique_offsets(xs, ys):
+    """Drops repeated points (the symmetric copies on the axes and diagonals), keeping the first of each."""
+    keys = np.stack([xs, ys], axis=1)
+    _, first = np.unique(keys, axis=0, return_index=True)
+    first.sort()
+    xs, ys = xs[first], ys[first]
+    xs.flags.writeable = False # Shared cached arrays must not be modified
+    ys.flags.writeable = False
+    return xs, ys
+
+
+def _spans(rows, half_widths):
+    """Widest half-width for every row offset, mirrored to both sides of the centre row (read-only)."""
+    if not len(rows):
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    half = np.full(rows.max() + 1, -1, dtype=np.int64)
+    np.maximum.at(half, rows, half_widths)
+    dy = np.arange(1 - len(half), len(half))
+    half = np.concatenate([half[:0:-1], half])
+    covered = half >= 0
+    dy, half = dy[covered], half[covered]
+    dy.flags.writeable = False
+    half.flags.writeable = False
+    return dy, half
+
+
+@lru_cache(maxsize=256)
+def circle_offsets(r):
+    """Unique pixel offsets of the midpoint circle of radius r from its centre (read-only, cached)."""
+    return _unique_offsets(*rasterize_circles([(0, 0)], [r])[:2])
+
+
+@lru_cache(maxsize=256)
+def ellipse_offsets(rx, ry):
+    """Unique pixel offsets of the midpoint ellipse with radii (rx, ry) from its centre (read-only, cached)."""
+    return _unique_offsets(*rasterize_ellipses([(0, 0)], [(rx, ry)])[:2])
+
+
+@lru_cache(maxsize=256)
+def circle_spans(r):
+    """Scanlines of the filled midpoint circle of radius r: row offsets dy and half-widths (read-only, cached)."""
+    xs, ys, valid = circle_steps([r])
+    x, y = xs[valid], ys[valid]
+    # Шаг (x, y) задаёт строки ±y полуширины x и строки ±x полуширины y
+    return _spans(np.concatenate([y, x]), np.concatenate([x, y]))
+
+
+@lru_cache(maxsize=256)
+def ellipse_spans(rx, ry):
+    """Scanlines of the filled midpoint ellipse with radii (rx, ry): row offsets dy and half-widths (read-only, cached)."""
+    xs, ys, valid = ellipse_steps([rx], [ry])
+    x, y = xs[valid], ys[valid]
+    return _spans(np.abs(y), x)
@@ -1,78 +1,117 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
 import math
-import time
+
+import numpy as np
+
+from conic import (MAX_STEPS, ellipse_coefficients, hyperbola_coefficients, parabola_coefficients,
+                   trace_conic)
+from curve_batch import circle_offsets, circle_spans, ellipse_offsets, ellipse_spans
+from pixel_buffer import DebugView, PixelBuffer
 
 # --- Configuration ---
 CANVAS_WIDTH = 600
 CANVAS_HEIGHT = 500
 DEBUG_GRID_SIZE = 300
-DEBUG_CELL_SIZE = 10 # Size of each cell in the debug grid
-DEBUG_DELAY_MS = 100 # Delay between ALGORITHM STEPS in debug mode (ms). 0 for instant.
+DEBUG_CELL_SIZE = 10 # Default size of each cell in the debug grid (zoomable)
+DEBUG_DELAY_MS = 100 # Default delay between ALGORITHM STEPS in debug mode (ms). 0 for fastest.
+MAX_DEBUG_DELAY_MS = 1000
 
 # --- Drawing Algorithms (Midpoint/Bresenham variations) ---
 
 class CurveDrawer:
     """Handles plotting pixels on main and debug canvases."""
-    def __init__(self, main_canvas, debug_canvas, debug_origin_offset):
+    def __init__(self, main_canvas, debug_view, pixel_buffer):
         self.main_canvas = main_canvas
-        self.debug_canvas = debug_canvas
-        self.debug_origin_x, self.debug_origin_y = debug_origin_offset
+        self.debug_view = debug_view
+        self.pixel_buffer = pixel_buffer
         # Определяем активность debug режима сразу при создании
-        self.debug_active = self.debug_canvas is not None and self.debug_canvas.winfo_exists()
-        # Убираем буфер шагов
-        # self.steps_buffer = []
-
-    def _plot_on_main(self, x, y, color="black"):
-        """Plots a single 'pixel' on the main canvas."""
-        # Use create_rectangle for a 1x1 pixel or create_oval
-        if self.main_canvas: # Проверка, что канвас существует
-            self.main_canvas.create_rectangle(x, y, x+1, y+1, fill=color, outline=color)
+        self.debug_active = self.debug_view is not None and self.debug_view.canvas.winfo_exists()
+        # Точки, ещё не записанные в буфер: цвет -> (список x, список y)
+        self.pending = {}
+        self.pending_spans = {} # цвет -> (строки, начала, концы)
+        self.pending_intensities = {} # цвет -> (x, y, покрытие) для сглаженных кривых
+        self.pending_debug = ([], []) # Клетки отладочной сетки
+
+    def _plot_on_main(self, x, y, color="black", intensity=None):
+        """Queues a single pixel for the main canvas (partly covered if intensity is given); it appears on the next flush()."""
+        if intensity is not None:
+            xs, ys, intensities = self.pending_intensities.setdefault(color, ([], [], []))
+            intensities.append(intensity)
+        else:
+            xs, ys = self.pending.setdefault(color, ([], []))
+        xs.append(x)
+        ys.append(y)
+
+    def flush(self):
+        """Writes all queued pixels into the pixel buffer and uploads the changed area once."""
+        for color, (xs, ys) in self.pending.items():
+            rgb = [c >> 8 for c in self.main_canvas.winfo_rgb(color)] # 16-bit Tk color -> 8-bit
+            self.pixel_buffer.put(np.array(xs), np.array(ys), rgb)
+        self.pending.clear()
+        for color, (ys, x0s, x1s) in self.pending_spans.items():
+            rgb = [c >> 8 for c in self.main_canvas.winfo_rgb(color)]
+            self.pixel_buffer.put_spans(np.array(ys), np.array(x0s), np.array(x1s), rgb)
+        self.pending_spans.clear()
+        for color, (xs, ys, intensities) in self.pending_intensities.items():
+            rgb = [c >> 8 for c in self.main_canvas.winfo_rgb(color)]
+            self.pixel_buffer.put_intensities(np.array(xs), np.array(ys), np.array(intensities), rgb)
+        self.pending_intensities.clear()
+        self.pixel_buffer.flush()
+        if self.debug_active and self.pending_debug[0]:
+            self.debug_view.add_cells(*self.pending_debug)
+            self.pending_debug = ([], [])
+            self.debug_view.flush()
 
     def _plot_on_debug(self, grid_x, grid_y, step_info=""):
-        """Highlights a cell on the debug grid."""
+        """Queues a cell to highlight on the debug grid; it appears on the next flush()."""
         if not self.debug_active:
             return
+        xs, ys = self.pending_debug
+        xs.append(grid_x)
+        ys.append(grid_y)
 
-        # Convert algorithm grid coordinates to debug canvas coordinates
-        canvas_x = self.debug_origin_x + grid_x * DEBUG_CELL_SIZE
-        canvas_y = self.debug_origin_y - grid_y * DEBUG_CELL_SIZE # Y is inverted
-
-        # Ensure it's within reasonable bounds for the debug grid display
-        if abs(grid_x) * DEBUG_CELL_SIZE > DEBUG_GRID_SIZE // 2 or \
-           abs(grid_y) * DEBUG_CELL_SIZE > DEBUG_GRID_SIZE // 2:
-           return # Skip plotting if too far from origin
-
-        # Проверка, что debug канвас существует
-        if self.debug_canvas and self.debug_canvas.winfo_exists():
-            self.debug_canvas.create_rectangle(
-                canvas_x - DEBUG_CELL_SIZE // 2, canvas_y - DEBUG_CELL_SIZE // 2,
-                canvas_x + DEBUG_CELL_SIZE // 2, canvas_y + DEBUG_CELL_SIZE // 2,
-                fill="red", outline="darkred", tags="debug_step"
-            )
-
-    def plot_pixel(self, center_x, center_y, x, y, color="black", step_info=""):
-        """ Plots a single point relative to the center on both canvases IMMEDIATELY. """
+    def plot_pixel(self, center_x, center_y, x, y, color="black", step_info="", intensity=None):
+        """ Plots a single point relative to the center (on both canvases on the next flush). """
         main_x, main_y = center_x + x, center_y + y
-        self._plot_on_main(main_x, main_y, color)
+        self._plot_on_main(main_x, main_y, color, intensity)
         self._plot_on_debug(x, y, step_info)
-        # self.steps_buffer.append((center_x, center_y, x, y, color, step_info))
+
+    def plot_span(self, center_x, center_y, half_width, y, color="black"):
+        """Fills row y from -half_width to half_width relative to the center; the span ends are shown on the debug grid."""
+        ys, x0s, x1s = self.pending_spans.setdefault(color, ([], [], []))
+        ys.append(center_y + y)
+        x0s.append(center_x - half_width)
+        x1s.append(center_x + half_width)
+        self._plot_on_debug(-half_width, y)
+        self._plot_on_debug(half_width, y)
 
     # Функции plot_..._points вызывают plot_pixel для каждой симметричной точки
-    def plot_circle_points(self, xc, yc, x, y, color="black"):
-        """Plots all 8 symmetric points for a circle centered at (xc, yc)."""
+    def plot_circle_points(self, xc, yc, x, y, color="black", intensity=None):
+        """Plots all 8 symmetric points for a circle centered at (xc, yc), optionally with a coverage intensity."""
         points = [
             (x, y), (-x, y), (x, -y), (-x, -y),
             (y, x), (-y, x), (y, -x), (-y, -x)
         ]
         for dx, dy in points:
-             self.plot_pixel(xc, yc, dx, dy, color)
+             self.plot_pixel(xc, yc, dx, dy, color, intensity=intensity)
 
-    def plot_ellipse_points(self, xc, yc, x, y, color="black"):
-        """Plots all 4 symmetric points for an ellipse centered at (xc, yc)."""
+    def plot_ellipse_points(self, xc, yc, x, y, color="black", intensity=None):
+        """Plots all 4 symmetric points for an ellipse centered at (xc, yc), optionally with a coverage intensity."""
         points = [(x, y), (-x, y), (x, -y), (-x, -y)]
         for dx, dy in points:
-             self.plot_pixel(xc, yc, dx, dy, color)
+             self.plot_pixel(xc, yc, dx, dy, color, intensity=intensity)
+
+    # Функции plot_..._spans заливают строки, проходящие через симметричные точки
+    def plot_circle_spans(self, xc, yc, x, y, color="black"):
+        """Fills the 4 scanlines through the 8 symmetric points of a circle."""
+        for half_width, dy in ((x, y), (x, -y), (y, x), (y, -x)):
+            self.plot_span(xc, yc, half_width, dy, color)
+
+    def plot_ellipse_spans(self, xc, yc, x, y, color="black"):
+        """Fills the 2 scanlines through the 4 symmetric points of an ellipse."""
+        for dy in (y, -y):
+            self.plot_span(xc, yc, x, dy, color)
 
     def plot_hyperbola_points(self, xc, yc, x, y, color="black"):
         """Plots symmetric points for a hyperbola (x^2/a^2 - y^2/b^2 = 1) centered at (xc, yc).
@@ -88,55 +127,39 @@ class CurveDrawer:
 
     def plot_parabola_points(self, vx, vy, x, y, orientation="y=ax^2", color="black"):
         """Plots symmetric points for a parabola with vertex (vx, vy)."""
-        points = []
-        if orientation == "y=ax^2":
+        # The mirrored point coincides with (x, y) on the axis of symmetry, so it is skipped there
+        if orientation == "y=ax^2" and x != 0:
             # For y=ax^2, symmetry is across the y-axis (relative to vertex)
             points = [(x, y), (-x, y)]
-        elif orientation == "x=ay^2":
+        elif orientation == "x=ay^2" and y != 0:
              # For x=ay^2, symmetry is across the x-axis (relative to vertex)
              points = [(x, y), (x, -y)]
         else:
-             points = [(x,y)] # Default if orientation unknown
+             points = [(x, y)] # On the axis, or orientation unknown
 
-        # Filter duplicate points if x or y is 0 for the symmetric pair
-        unique_points = []
-        seen = set()
-        for p in points:
-            if p not in seen:
-                unique_points.append(p)
-                seen.add(p)
-
-        for dx, dy in unique_points:
+        for dx, dy in points:
              # Plot relative to vertex
              self.plot_pixel(vx, vy, dx, dy, color)
 
-    # Убираем finalize_drawing, т.к. буфера нет
-    # def finalize_drawing(self): ...
-
-    def step_delay(self):
-        """Introduces a delay and forces canvas update if debug mode is active."""
-        if self.debug_active and DEBUG_DELAY_MS > 0:
-            # Force update on both canvases to show the plotted pixel immediately
-            if self.main_canvas and self.main_canvas.winfo_exists():
-                self.main_canvas.update() # or update_idletasks()
-            if self.debug_canvas and self.debug_canvas.winfo_exists():
-                self.debug_canvas.update() # or update_idletasks()
-            # Pause execution - WARNING: Freezes GUI
-            time.sleep(DEBUG_DELAY_MS / 1000.0)
-
 
 # --- Midpoint Algorithms ---
 
-def draw_circle_midpoint(drawer, xc, yc, r):
-    """Draws a circle using the Midpoint algorithm."""
+# Each draw_* function is a generator: it plots one algorithm step and then yields,
+# so the caller decides when (and whether) the next step runs.
+
+def draw_circle_midpoint(drawer, xc, yc, r, filled=False):
+    """Draws a circle using the Midpoint algorithm, yielding after every step.
+       With filled=True each step fills the scanlines through its symmetric points instead.
+    """
     if r < 0: return
+    plot_points = drawer.plot_circle_spans if filled else drawer.plot_circle_points
     x = 0
     y = r
     p = 1 - r
 
     # Plot initial point and symmetric points
-    drawer.plot_circle_points(xc, yc, x, y)
-    drawer.step_delay() # <-- Add delay after plotting step
+    plot_points(xc, yc, x, y)
+    yield
 
     while x < y:
         x += 1
@@ -146,12 +169,15 @@ def draw_circle_midpoint(drawer, xc, yc, r):
             y -= 1
             p += 2 * (x - y) + 1
 
-        drawer.plot_circle_points(xc, yc, x, y)
-        drawer.step_delay() # <-- Add delay after plotting step
+        plot_points(xc, yc, x, y)
+        yield
 
-def draw_ellipse_midpoint(drawer, xc, yc, rx, ry):
-    """Draws an ellipse using the Midpoint algorithm."""
+def draw_ellipse_midpoint(drawer, xc, yc, rx, ry, filled=False):
+    """Draws an ellipse using the Midpoint algorithm, yielding after every step.
+       With filled=True each step fills the scanlines through its symmetric points instead.
+    """
     if rx <= 0 or ry <= 0: return
+    plot_points = drawer.plot_ellipse_spans if filled else drawer.plot_ellipse_points
     rx2 = rx * rx
     ry2 = ry * ry
     two_rx2 = 2 * rx2
@@ -164,8 +190,8 @@ def draw_ellipse_midpoint(drawer, xc, yc, rx, ry):
     px = 0
     py = two_rx2 * y
 
-    drawer.plot_ellipse_points(xc, yc, x, y)
-    drawer.step_delay() # <-- Add delay
+    plot_points(xc, yc, x, y)
+    yield
 
     while px < py:
         x += 1
@@ -176,8 +202,8 @@ def draw_ellipse_midpoint(drawer, xc, yc, rx, ry):
             y -= 1
             py -= two_rx2
             p += ry2 + px - py
-        drawer.plot_ellipse_points(xc, yc, x, y)
-        drawer.step_delay() # <-- Add delay
+        plot_points(xc, yc, x, y)
+        yield
 
     # --- Region 2 ---
     p = round(ry2 * (x + 0.5)**2 + rx2 * (y - 1)**2 - rx2 * ry2)
@@ -191,145 +217,294 @@ def draw_ellipse_midpoint(drawer, xc, yc, rx, ry):
             x += 1
             px += two_ry2
             p += rx2 - py + px
-        drawer.plot_ellipse_points(xc, yc, x, y)
-        drawer.step_delay() # <-- Add delay
+        plot_points(xc, yc, x, y)
+        yield
+
+# Сглаженные (Wu) варианты: на каждом шаге кривая проходит между двумя соседними
+# пикселями, и значение неявной функции в них делит покрытие между ними.
+
+def draw_circle_wu(drawer, xc, yc, r):
+    """Draws an anti-aliased circle, yielding after every step.
+       F(x, y) = x^2 + y^2 - r^2 is kept with integer updates for the outer pixel y
+       (F(x, y) >= 0 > F(x, y - 1)); F / (F(x, y) - F(x, y - 1)) is the share of the inner pixel.
+    """
+    if r <= 0: return
+    x = 0
+    y = r
+    f = 0 # F(x, y)
 
-def draw_hyperbola_midpoint(drawer, xc, yc, a, b):
-    """Draws a hyperbola (x^2/a^2 - y^2/b^2 = 1) using direct calculation."""
-    if a <= 0 or b <= 0: return
+    while x < y:
+        t = f / (2 * y - 1) # Кривая проходит на расстоянии t от внешнего пикселя
+        drawer.plot_circle_points(xc, yc, x, y, intensity=1 - t)
+        drawer.plot_circle_points(xc, yc, x, y - 1, intensity=t)
+        yield
 
-    a2 = a * a
-    b2 = b * b
+        x += 1
+        f += 2 * x - 1
+        while y > 0 and f >= 2 * y - 1: # F(x, y - 1) >= 0: внутренний пиксель тоже снаружи
+            f -= 2 * y - 1
+            y -= 1
 
-    # --- Используем прямое вычисление точек ---
-    # Рисуем только правую ветвь, первая координатная четверть (x>0, y>0)
-    # plot_hyperbola_points затем отразит их симметрично для полной картины
-    print(f"Drawing hyperbola using direct calculation (not Midpoint algorithm steps)")
+def draw_ellipse_wu(drawer, xc, yc, rx, ry):
+    """Draws an anti-aliased ellipse, yielding after every step.
+       Uses F(x, y) = ry^2 x^2 + rx^2 y^2 - rx^2 ry^2 like draw_circle_wu: the pixel pair
+       is vertical while the slope is below 1 (region 1) and horizontal after it (region 2).
+    """
+    if rx <= 0 or ry <= 0: return
+    rx2 = rx * rx
+    ry2 = ry * ry
 
-    # Установим разумный предел отрисовки, чтобы не уходить в бесконечность
-    x_limit_canvas = CANVAS_WIDTH * 1.5 # Рисуем немного за пределы видимой части
-    y_limit_canvas = CANVAS_HEIGHT * 1.5
+    # --- Region 1: шаг по x, пара пикселей (x, y) и (x, y - 1) ---
+    x = 0
+    y = ry
+    f = 0 # F(x, y)
 
-    last_plot_x, last_plot_y = -1, -1
+    while ry2 * x < rx2 * y:
+        t = f / (rx2 * (2 * y - 1))
+        drawer.plot_ellipse_points(xc, yc, x, y, intensity=1 - t)
+        drawer.plot_ellipse_points(xc, yc, x, y - 1, intensity=t)
+        yield
+        last_x, last_y = x, y
 
-    # Итерация по X для основной части ветви
-    x_rel = a
-    while xc + x_rel < x_limit_canvas :
-        y_rel_exact = b * math.sqrt(max(0, (x_rel * x_rel / a2) - 1.0))
-        y_rel = round(y_rel_exact)
+        f += ry2 * (2 * x + 1)
+        x += 1
+        while y > 0 and f >= rx2 * (2 * y - 1):
+            f -= rx2 * (2 * y - 1)
+            y -= 1
 
-        if yc + y_rel > y_limit_canvas and yc - y_rel < -y_limit_canvas : # Выход если ушли далеко по Y
-             break
+    # --- Region 2: шаг по y, пара пикселей (x, y) и (x - 1, y) ---
+    # Последний шаг области 1 мог пропустить несколько строк, поэтому начинаем
+    # со строки под последней парой и заново находим внешний пиксель
+    x, y = last_x, last_y - 1
+    f = ry2 * x * x + rx2 * y * y - rx2 * ry2
+    while f < 0:
+        f += ry2 * (2 * x + 1)
+        x += 1
+    while x > 0 and f >= ry2 * (2 * x - 1):
+        f -= ry2 * (2 * x - 1)
+        x -= 1
 
-        # Избегаем повторной отрисовки одной и той же точки (особенно в начале)
-        if x_rel != last_plot_x or y_rel != last_plot_y:
-             drawer.plot_hyperbola_points(xc, yc, x_rel, y_rel)
-             drawer.step_delay() # <-- Задержка после отрисовки симметричных точек
-             last_plot_x, last_plot_y = x_rel, y_rel
+    while y >= 0:
+        t = f / (ry2 * (2 * x - 1))
+        drawer.plot_ellipse_points(xc, yc, x, y, intensity=1 - t)
+        drawer.plot_ellipse_points(xc, yc, x - 1, y, intensity=t)
+        yield
 
-        # Увеличиваем X. Шаг может быть адаптивным, но для простоты +1
-        x_rel += 1
+        f -= rx2 * (2 * y - 1)
+        y -= 1
+        while f < 0: # Кривая ушла дальше по x
+            f += ry2 * (2 * x + 1)
+            x += 1
 
-    # Можно добавить итерацию по Y для участков, где кривая идет почти вертикально,
-    # но для элементарного редактора текущий подход достаточен для демонстрации формы.
+def draw_hyperbola_midpoint(drawer, xc, yc, a, b, width=CANVAS_WIDTH, height=CANVAS_HEIGHT):
+    """Draws a hyperbola (x^2/a^2 - y^2/b^2 = 1) using the Midpoint algorithm, yielding after every step.
+       Only integer arithmetic is used; drawing stops once the branches leave the width x height canvas.
+    """
+    if a <= 0 or b <= 0: return
 
+    a2 = a * a
+    b2 = b * b
 
-def draw_parabola_midpoint(drawer, vx, vy, p_focus, orientation="y=ax^2"):
-    """Draws a parabola using Midpoint."""
+    # Первая четверть правой ветви, остальное даёт симметрия.
+    # x и y только растут, поэтому когда x или y выходит за самое дальнее от центра
+    # расстояние до края холста, все четыре симметричные точки уже невидимы.
+    x_limit = max(xc, width - 1 - xc)
+    y_limit = max(yc, height - 1 - yc)
+
+    x = a
+    y = 0
+    drawer.plot_hyperbola_points(xc, yc, x, y)
+    yield
+
+    # --- Region 1: наклон > 1 (у вершины ветвь почти вертикальна), шаг по y ---
+    # d = 4 * F(x + 1/2, y + 1), F(x, y) = b^2 x^2 - a^2 y^2 - a^2 b^2
+    d = b2 * (2 * x + 1) ** 2 - 4 * a2 * (y + 1) ** 2 - 4 * a2 * b2
+    # Наклон проверяется в следующей средней точке (x + 1/2, y + 1): у острой вершины он падает
+    # ниже 1 ещё до первого шага по y, и тогда сразу нужен шаг по x
+    while b2 * (2 * x + 1) > 2 * a2 * (y + 1) and x <= x_limit and y <= y_limit:
+        if d < 0: # Середина левее кривой - шаг по x тоже
+            x += 1
+            d += 8 * b2 * x
+        y += 1
+        d -= 4 * a2 * (2 * y + 1)
+        drawer.plot_hyperbola_points(xc, yc, x, y)
+        yield
+
+    # --- Region 2: наклон <= 1 (только при b < a), шаг по x ---
+    # d = 4 * F(x + 1, y + 1/2)
+    d = 4 * b2 * (x + 1) ** 2 - a2 * (2 * y + 1) ** 2 - 4 * a2 * b2
+    while x <= x_limit and y <= y_limit:
+        if d > 0: # Середина ниже кривой - шаг по y тоже
+            y += 1
+            d -= 8 * a2 * y
+        x += 1
+        d += 4 * b2 * (2 * x + 1)
+        drawer.plot_hyperbola_points(xc, yc, x, y)
+        yield
+
+
+def _parabola_points(p, u_limit, v_limit):
+    """Yields the points (u, v), u, v >= 0, of the parabola u^2 = 4pv (p > 0, integer) with the Midpoint algorithm.
+       Stops once u passes u_limit or v passes v_limit. Only integer arithmetic is used.
+    """
+    u = 0
+    v = 0
+    yield u, v
+
+    # Region 1: наклон dv/du = u / 2p < 1, шаг по u
+    # d = F(u + 1, v + 1/2), F(u, v) = u^2 - 4pv
+    d = 1 - 2 * p
+    while 2 * u < 4 * p and u <= u_limit and v <= v_limit:
+        u += 1
+        if d < 0: # Середина внутри - шаг только по u
+            d += 2 * u + 1
+        else: # Шаг по диагонали
+            v += 1
+            d += 2 * u + 1 - 4 * p
+        yield u, v
+
+    # Region 2: наклон >= 1, шаг по v
+    # d = 4 * F(u + 1/2, v + 1) = (2u + 1)^2 - 16p(v + 1), пересчитывается только приращениями
+    d = (2 * u + 1) ** 2 - 16 * p * (v + 1)
+    while u <= u_limit and v <= v_limit:
+        v += 1
+        if d <= 0: # Середина внутри или на кривой - шаг по диагонали
+            u += 1
+            d += 8 * u - 16 * p
+        else: # Шаг только по v
+            d -= 16 * p
+        yield u, v
+
+
+def draw_parabola_midpoint(drawer, vx, vy, p_focus, orientation="y=ax^2", width=CANVAS_WIDTH, height=CANVAS_HEIGHT):
+    """Draws a parabola with vertex (vx, vy) using Midpoint, yielding after every step.
+       p_focus is the signed vertex-to-focus distance: the parabola opens towards the focus.
+       Drawing stops once the curve leaves the width x height canvas.
+    """
     if p_focus == 0: return # Degenerate case
     p_abs = abs(p_focus) # Algorithm usually uses distance
+    sign = 1 if p_focus > 0 else -1
 
     if orientation == "y=ax^2":
-        # y = x^2 / (4p) -> x^2 = 4py
-        x = 0
-        y = 0
-        # Decision parameter F(1, 0.5) = 1 - 4*p*0.5 = 1 - 2p
-        d = 1 - 2 * p_abs
-        drawer.plot_parabola_points(vx, vy, x, y, orientation)
-        drawer.step_delay()
-        limit_y = CANVAS_HEIGHT * 1.5 # Arbitrary limit
-
-        # Region 1: slope |m| < 1 (iterate x)
-        # Condition where slope = 1: dy/dx = 2x/(4p) = 1 -> x = 2p
-        while 2 * x < 4 * p_abs and y < limit_y :
-            x += 1
-            if d < 0: # Choose E (East)
-                d += 2 * x + 1
-            else: # Choose NE (North-East)
-                y += 1
-                d += 2 * x + 1 - 4 * p_abs
-            drawer.plot_parabola_points(vx, vy, x, y, orientation)
-            drawer.step_delay()
-
-        # Region 2: slope |m| >= 1 (iterate y)
-        # Decision parameter F(x+0.5, y+1) = (x+0.5)^2 - 4*p*(y+1)
-        # Simplified relative decision: check F(x+1, y+1) vs F(x, y+1)?
-        # Let's recalculate d based on midpoint F(x+0.5, y+1) relative to last point
-        d = (x + 0.5)**2 - 4*p_abs*(y+1) # Needs careful check
-
-        while y < limit_y: # Iterate until out of bounds
-            y += 1
-            if d <= 0: # Midpoint inside or on curve - Choose NE
-                x += 1
-                # Update d based on moving from (x,y) to (x+1, y+1)
-                # d_new = d_old + (2x+1) - 4p --> Check derivation
-                d += 2*x + 1 - 4*p_abs # Simplified update based on F(x+1.5, y+1) - F(x+0.5, y+1)? No.
-                # d_new = F(x+1+0.5, y+1+1) ?? Complex. Use relative test.
-                # d = (x+0.5)**2 - 4*p_abs*(y+1) # Recalculate instead of incremental (less efficient but safer)
-            else: # Midpoint outside - Choose N
-                 # Update d based on moving from (x,y) to (x, y+1)
-                 # d_new = d_old - 4p
-                 d -= 4*p_abs # Simplified update based on F(x+0.5, y+1+1) - F(x+0.5, y+1)
-
-            # Recalculate d to be safe, midpoint approach detail is tricky
-            d = (x + 0.5)**2 - 4*p_abs*(y+1)
-
-            drawer.plot_parabola_points(vx, vy, x, y, orientation)
-            drawer.step_delay()
+        # y = x^2 / (4p) -> x^2 = 4py; ветви симметричны относительно оси x = vx
+        u_limit = max(vx, width - 1 - vx)
+        v_limit = height - 1 - vy if sign > 0 else vy
+        for x, y in _parabola_points(p_abs, u_limit, v_limit):
+            drawer.plot_parabola_points(vx, vy, x, sign * y, orientation)
+            yield
 
     elif orientation == "x=ay^2":
-        # x = y^2 / (4p) -> y^2 = 4px
-        x = 0
-        y = 0
-        # Decision param F(0.5, 1) = 1 - 4*p*0.5 = 1 - 2p
-        d = 1 - 2 * p_abs
-        drawer.plot_parabola_points(vx, vy, x, y, orientation)
-        drawer.step_delay()
-        limit_x = CANVAS_WIDTH * 1.5
-
-        # Region 1: slope |m| > 1 (iterate y)
-        # Condition slope = 1: dx/dy = 2y/(4p) = 1 -> y = 2p
-        while 2 * y < 4 * p_abs and x < limit_x:
-            y += 1
-            if d < 0: # Choose N (North)
-                d += 2 * y + 1
-            else: # Choose NE
-                x += 1
-                d += 2 * y + 1 - 4 * p_abs
-            drawer.plot_parabola_points(vx, vy, x, y, orientation)
-            drawer.step_delay()
-
-        # Region 2: slope |m| <= 1 (iterate x)
-        # Decision param F(x+1, y+0.5) = (y+0.5)^2 - 4p(x+1)
-        d = (y + 0.5)**2 - 4*p_abs*(x+1)
-
-        while x < limit_x:
-            x += 1
-            if d <= 0: # Midpoint inside or on curve - Choose NE
-                y += 1
-                d += 2*y + 1 - 4*p_abs # Update based on moving NE
-            else: # Midpoint outside - Choose E
-                 d -= 4 * p_abs # Update based on moving E
-
-            # Recalculate d for safety
-            d = (y + 0.5)**2 - 4*p_abs*(x+1)
-
-            drawer.plot_parabola_points(vx, vy, x, y, orientation)
-            drawer.step_delay()
+        # x = y^2 / (4p) -> y^2 = 4px; ветви симметричны относительно оси y = vy
+        u_limit = max(vy, height - 1 - vy)
+        v_limit = width - 1 - vx if sign > 0 else vx
+        for y, x in _parabola_points(p_abs, u_limit, v_limit):
+            drawer.plot_parabola_points(vx, vy, sign * x, y, orientation)
+            yield
     else:
         print("Unsupported parabola orientation")
 
 
+def draw_conic_midpoint(drawer, xc, yc, coefficients, starts, closed=False, max_steps=MAX_STEPS,
+                        width=CANVAS_WIDTH, height=CANVAS_HEIGHT):
+    """Draws the conic A x^2 + B xy + C y^2 + D x + E y + F = 0 (coordinates relative to (xc, yc)),
+       tracking it from each start pixel and yielding after every step. A closed curve is tracked once
+       around; an open one in both directions until it leaves the width x height canvas.
+    """
+    bounds = (-xc, -yc, width - 1 - xc, height - 1 - yc)
+    for start in starts:
+        drawer.plot_pixel(xc, yc, *start)
+        yield
+        for direction in ((1,) if closed else (1, -1)):
+            for x, y in trace_conic(coefficients, start, direction, None if closed else bounds, closed, max_steps):
+                drawer.plot_pixel(xc, yc, x, y)
+                yield
+
+
+# --- Step Animation ---
+
+class StepAnimator:
+    """Runs a step generator one step per after() callback, so the GUI stays responsive."""
+    def __init__(self, widget, delay_ms=DEBUG_DELAY_MS, on_change=None):
+        self.widget = widget
+        self.delay_ms = delay_ms
+        self.on_change = on_change # Called whenever the animation starts, pauses, resumes or stops
+        self.steps = None
+        self.job = None
+        self.paused = False
+
+    @property
+    def active(self):
+        return self.steps is not None
+
+    def start(self, steps):
+        """Starts animating a new generator, completing any previous one first."""
+        self.finish()
+        self.steps = steps
+        self.paused = False
+        self._notify()
+        self._tick() # The first step is shown immediately
+
+    def pause(self):
+        if self.active and not self.paused:
+            self._cancel_job()
+            self.paused = True
+            self._notify()
+
+    def resume(self):
+        if self.active and self.paused:
+            self.paused = False
+            self._notify()
+            self._schedule()
+
+    def set_delay(self, delay_ms):
+        """Changes the delay between steps; takes effect from the next step."""
+        self.delay_ms = max(0, int(delay_ms))
+
+    def cancel(self):
+        """Stops the animation, leaving the steps drawn so far."""
+        if self.active:
+            self._cancel_job()
+            self.steps.close()
+            self._stop()
+
+    def finish(self):
+        """Runs all remaining steps at once."""
+        if self.active:
+            self._cancel_job()
+            for _ in self.steps:
+                pass
+            self._stop()
+
+    def _schedule(self):
+        self.job = self.widget.after(self.delay_ms, self._tick)
+
+    def _cancel_job(self):
+        if self.job is not None:
+            self.widget.after_cancel(self.job)
+            self.job = None
+
+    def _tick(self):
+        self.job = None
+        try:
+            next(self.steps)
+        except StopIteration:
+            self._stop()
+        except Exception:
+            self._stop()
+            raise # Reported by Tk's callback error handler
+        else:
+            self._schedule()
+
+    def _stop(self):
+        self.steps = None
+        self.paused = False
+        self._notify()
+
+    def _notify(self):
+        if self.on_change:
+            self.on_change()
+
+
 # --- Main Application Class ---
 
 class GraphicsEditor(tk.Tk):
@@ -344,8 +519,11 @@ class GraphicsEditor(tk.Tk):
         self.click_points = []
         self.debug_window = None
         self.debug_canvas = None
-        # self.debug_grid_drawn = False # Not strictly needed anymore
-        self.debug_origin_offset = (DEBUG_GRID_SIZE // 2, DEBUG_GRID_SIZE // 2)
+        self.debug_view = None
+        self.pan_anchor = None # Last mouse position while dragging the debug view
+        self.step_delay_var = tk.IntVar(value=DEBUG_DELAY_MS)
+        self.pause_button = None
+        self.animator = StepAnimator(self, DEBUG_DELAY_MS, on_change=self._on_animation_change)
 
         # UI Elements
         self._setup_ui()
@@ -370,6 +548,15 @@ class GraphicsEditor(tk.Tk):
         curves_menu.add_command(label="Ellipse", command=lambda: self._set_mode('ellipse'))
         curves_menu.add_command(label="Hyperbola", command=lambda: self._set_mode('hyperbola'))
         curves_menu.add_command(label="Parabola", command=lambda: self._set_mode('parabola'))
+        curves_menu.add_separator()
+        curves_menu.add_command(label="Filled Circle", command=lambda: self._set_mode('filled_circle'))
+        curves_menu.add_command(label="Filled Ellipse", command=lambda: self._set_mode('filled_ellipse'))
+        curves_menu.add_command(label="Antialiased Circle", command=lambda: self._set_mode('antialiased_circle'))
+        curves_menu.add_command(label="Antialiased Ellipse", command=lambda: self._set_mode('antialiased_ellipse'))
+        curves_menu.add_separator()
+        curves_menu.add_command(label="Rotated Ellipse", command=lambda: self._set_mode('rotated_ellipse'))
+        curves_menu.add_command(label="Tilted Hyperbola", command=lambda: self._set_mode('tilted_hyperbola'))
+        curves_menu.add_command(label="Tilted Parabola", command=lambda: self._set_mode('tilted_parabola'))
         self.menu_bar.add_cascade(label="Curves", menu=curves_menu)
 
         view_menu = tk.Menu(self.menu_bar, tearoff=0)
@@ -391,6 +578,8 @@ class GraphicsEditor(tk.Tk):
         # --- Main Canvas ---
         self.main_canvas = tk.Canvas(self, width=CANVAS_WIDTH, height=CANVAS_HEIGHT, bg="white", relief=tk.SUNKEN, borderwidth=1)
         self.main_canvas.pack(side=tk.TOP, fill=tk.BOTH, expand=True, padx=5, pady=5)
+        # All curve pixels go into one image on the canvas
+        self.pixel_buffer = PixelBuffer(self.main_canvas, CANVAS_WIDTH, CANVAS_HEIGHT)
         self.main_canvas.bind("<Button-1>", self._on_canvas_click)
         # Optional: Bind right-click to cancel current point selection
         self.main_canvas.bind("<Button-3>", self._cancel_clicks)
@@ -410,10 +599,17 @@ class GraphicsEditor(tk.Tk):
         instructions = {
             'circle': "Click 1: Center, Click 2: Point on circumference",
             'ellipse': "Click 1: Center, Click 2: Point on X-axis extent, Click 3: Point on Y-axis extent",
+            'filled_circle': "Click 1: Center, Click 2: Point on circumference",
+            'filled_ellipse': "Click 1: Center, Click 2: Point on X-axis extent, Click 3: Point on Y-axis extent",
+            'antialiased_circle': "Click 1: Center, Click 2: Point on circumference",
+            'antialiased_ellipse': "Click 1: Center, Click 2: Point on X-axis extent, Click 3: Point on Y-axis extent",
             'hyperbola': "Click 1: Center, Click 2: Vertex (defines 'a'), Click 3: Point defining 'b' distance on conjugate axis",
             'parabola': "Click 1: Vertex, Click 2: Focus point (defines 'p' and orientation)",
+            'rotated_ellipse': "Click 1: Center, Click 2: End of first axis (defines 'a' and rotation), Click 3: Point defining 'b' distance from that axis",
+            'tilted_hyperbola': "Click 1: Center, Click 2: Vertex (defines 'a' and rotation), Click 3: Point defining 'b' distance from the transverse axis",
+            'tilted_parabola': "Click 1: Vertex, Click 2: Focus point (any direction)",
         }
-        self.status_var.set(f"Mode: {mode.capitalize()}. {instructions.get(mode, '')} (Right-click to cancel)")
+        self.status_var.set(f"Mode: {mode.replace('_', ' ').capitalize()}. {instructions.get(mode, '')} (Right-click to cancel)")
 
     def _on_canvas_click(self, event):
         if not self.current_mode:
@@ -427,7 +623,9 @@ class GraphicsEditor(tk.Tk):
 
         # Check if enough points are collected for the current mode
         required_points = {
-            'circle': 2, 'ellipse': 3, 'hyperbola': 3, 'parabola': 2
+            'circle': 2, 'ellipse': 3, 'hyperbola': 3, 'parabola': 2,
+            'filled_circle': 2, 'filled_ellipse': 3, 'antialiased_circle': 2, 'antialiased_ellipse': 3,
+            'rotated_ellipse': 3, 'tilted_hyperbola': 3, 'tilted_parabola': 2
         }
 
         if len(self.click_points) == required_points.get(self.current_mode):
@@ -466,21 +664,18 @@ class GraphicsEditor(tk.Tk):
 
     def _get_drawer(self):
         """Creates a CurveDrawer instance with current debug canvas state."""
-        # Clear previous debug steps ONLY when starting a NEW curve drawing
-        if self.debug_canvas and self.debug_canvas.winfo_exists():
-            self.debug_canvas.delete("debug_step") # Clear old steps but keep grid
-            # Ensure grid is drawn if debug window was just opened
-            if not self.debug_canvas.find_withtag("grid_line"):
-                 self._draw_debug_grid()
-
-
+        self.animator.finish() # The previous curve completes before its debug steps are cleared
         # Check if debug window exists when creating drawer
-        current_debug_canvas = self.debug_canvas if (self.debug_window and self.debug_window.winfo_exists()) else None
+        current_debug_view = self.debug_view if (self.debug_window and self.debug_window.winfo_exists()) else None
+        # Clear previous debug steps ONLY when starting a NEW curve drawing
+        if current_debug_view:
+            current_debug_view.clear_cells() # Old steps go, the view keeps its pan and zoom
+            current_debug_view.flush()
 
         return CurveDrawer(
             self.main_canvas,
-            current_debug_canvas, # Pass current state
-            self.debug_origin_offset
+            current_debug_view, # Pass current state
+            self.pixel_buffer
         )
 
     def _draw_selected_curve(self):
@@ -492,18 +687,27 @@ class GraphicsEditor(tk.Tk):
 
         try:
             # --- Circle ---
-            if self.current_mode == 'circle' and len(pts) == 2:
+            if self.current_mode in ('circle', 'filled_circle', 'antialiased_circle') and len(pts) == 2:
                 xc, yc = pts[0]
                 xp, yp = pts[1]
                 r = round(math.hypot(xp - xc, yp - yc)) # Use hypot for distance
                 if r == 0:
                      messagebox.showwarning("Input Error", "Radius cannot be zero.")
                      return
-                self.status_var.set(f"Drawing Circle: Center=({xc},{yc}), Radius={r}")
-                draw_circle_midpoint(drawer, xc, yc, r)
+                filled = self.current_mode == 'filled_circle'
+                kind = {'filled_circle': 'Filled ', 'antialiased_circle': 'Antialiased '}.get(self.current_mode, '')
+                self.status_var.set(f"Drawing {kind}Circle: Center=({xc},{yc}), Radius={r}")
+                if self.current_mode == 'antialiased_circle':
+                    self._run_steps(drawer, draw_circle_wu(drawer, xc, yc, r)) # Без отладки все покрытия пишутся в буфер одним вызовом
+                elif drawer.debug_active:
+                    self._run_steps(drawer, draw_circle_midpoint(drawer, xc, yc, r, filled))
+                elif filled:
+                    self._draw_spans(xc, yc, circle_spans(r))
+                else:
+                    self._draw_offsets(xc, yc, circle_offsets(r))
 
             # --- Ellipse ---
-            elif self.current_mode == 'ellipse' and len(pts) == 3:
+            elif self.current_mode in ('ellipse', 'filled_ellipse', 'antialiased_ellipse') and len(pts) == 3:
                 xc, yc = pts[0]
                 x_pt, y_pt1 = pts[1] # Point defining rx-ish distance
                 x_pt2, y_pt2 = pts[2] # Point defining ry-ish distance
@@ -519,8 +723,17 @@ class GraphicsEditor(tk.Tk):
                 if rx == 0 or ry == 0:
                     messagebox.showwarning("Input Error", "Ellipse radii cannot be zero.")
                     return
-                self.status_var.set(f"Drawing Ellipse: Center=({xc},{yc}), Rx={rx}, Ry={ry}")
-                draw_ellipse_midpoint(drawer, xc, yc, rx, ry)
+                filled = self.current_mode == 'filled_ellipse'
+                kind = {'filled_ellipse': 'Filled ', 'antialiased_ellipse': 'Antialiased '}.get(self.current_mode, '')
+                self.status_var.set(f"Drawing {kind}Ellipse: Center=({xc},{yc}), Rx={rx}, Ry={ry}")
+                if self.current_mode == 'antialiased_ellipse':
+                    self._run_steps(drawer, draw_ellipse_wu(drawer, xc, yc, rx, ry))
+                elif drawer.debug_active:
+                    self._run_steps(drawer, draw_ellipse_midpoint(drawer, xc, yc, rx, ry, filled))
+                elif filled:
+                    self._draw_spans(xc, yc, ellipse_spans(rx, ry))
+                else:
+                    self._draw_offsets(xc, yc, ellipse_offsets(rx, ry))
 
             # --- Hyperbola ---
             elif self.current_mode == 'hyperbola' and len(pts) == 3:
@@ -552,8 +765,8 @@ class GraphicsEditor(tk.Tk):
                  if a == 0 or b == 0:
                      messagebox.showwarning("Input Error", "Hyperbola 'a' and 'b' must be non-zero.")
                      return
-                 self.status_var.set(f"Drawing Hyperbola: Center=({xc},{yc}), a={a}, b={b} (direct calculation)")
-                 draw_hyperbola_midpoint(drawer, xc, yc, a, b) # Uses direct calculation version
+                 self.status_var.set(f"Drawing Hyperbola: Center=({xc},{yc}), a={a}, b={b}")
+                 self._run_steps(drawer, draw_hyperbola_midpoint(drawer, xc, yc, a, b))
 
             # --- Parabola ---
             elif self.current_mode == 'parabola' and len(pts) == 2:
@@ -567,24 +780,19 @@ class GraphicsEditor(tk.Tk):
                       messagebox.showwarning("Input Error", "Vertex and Focus cannot be the same point.")
                       return
 
-                 # Determine orientation and signed focus distance 'p' for formula
-                 # Use p_algo for the absolute distance needed by the midpoint algorithm
+                 # Determine orientation and signed focus distance 'p' (the parabola opens towards the focus)
                  p_algo = 0
                  orientation = None
 
                  # If difference is primarily vertical -> opens vertically (y=ax^2 type)
                  if abs(dy) >= abs(dx):
                      orientation = "y=ax^2"
-                     # Algorithm needs distance |VF| along the axis of symmetry
-                     p_algo = round(abs(dy))
-                     # For formula: 4p = distance^2 / other_coord_diff? No.
-                     # For formula y=x^2/(4p) relative to vertex, p is distance V-F if F=(vx, vy+p)
-                     # p_formula = dy # Signed distance
+                     # For y=x^2/(4p) relative to vertex, p is the signed distance V-F if F=(vx, vy+p)
+                     p_algo = round(dy)
                  # If difference is primarily horizontal -> opens horizontally (x=ay^2 type)
                  else: # abs(dx) > abs(dy)
                      orientation = "x=ay^2"
-                     p_algo = round(abs(dx)) # Algorithm needs |VF| along axis
-                     # p_formula = dx # Signed distance for x=y^2/(4p)
+                     p_algo = round(dx) # Signed distance for x=y^2/(4p)
 
                  if p_algo == 0:
                       # This case should be caught by dx==0 and dy==0, but double check
@@ -592,16 +800,51 @@ class GraphicsEditor(tk.Tk):
                       return
 
                  self.status_var.set(f"Drawing Parabola: V=({vx},{vy}), p={p_algo}, Orient={orientation}")
-                 draw_parabola_midpoint(drawer, vx, vy, p_algo, orientation) # Pass absolute p needed by algo
+                 self._run_steps(drawer, draw_parabola_midpoint(drawer, vx, vy, p_algo, orientation))
+
+            # --- Rotated Ellipse / Tilted Hyperbola (general conic) ---
+            elif self.current_mode in ('rotated_ellipse', 'tilted_hyperbola') and len(pts) == 3:
+                 xc, yc = pts[0]
+                 xa, ya = pts[1] # End of the first (transverse) axis
+                 xb, yb = pts[2] # Point defining 'b'
+
+                 angle = math.atan2(ya - yc, xa - xc)
+                 a = math.hypot(xa - xc, ya - yc)
+                 # 'b' is the distance from the third point to the line of the first axis
+                 b = abs(-(xb - xc) * math.sin(angle) + (yb - yc) * math.cos(angle))
+
+                 if a < 1 or b < 1:
+                     messagebox.showwarning("Input Error", "Both 'a' and 'b' must be at least one pixel.")
+                     return
+                 start = (round(a * math.cos(angle)), round(a * math.sin(angle)))
+                 if self.current_mode == 'rotated_ellipse':
+                     self.status_var.set(f"Drawing Ellipse: Center=({xc},{yc}), a={a:.0f}, b={b:.0f}, angle={math.degrees(angle):.0f}")
+                     self._run_steps(drawer, draw_conic_midpoint(
+                         drawer, xc, yc, ellipse_coefficients(a, b, angle), [start],
+                         closed=True, max_steps=round(8 * (a + b)) + 16))
+                 else:
+                     self.status_var.set(f"Drawing Hyperbola: Center=({xc},{yc}), a={a:.0f}, b={b:.0f}, angle={math.degrees(angle):.0f}")
+                     self._run_steps(drawer, draw_conic_midpoint(
+                         drawer, xc, yc, hyperbola_coefficients(a, b, angle),
+                         [start, (-start[0], -start[1])])) # Both branches start at their vertices
+
+            # --- Tilted Parabola (general conic) ---
+            elif self.current_mode == 'tilted_parabola' and len(pts) == 2:
+                 vx, vy = pts[0] # Vertex
+                 fx, fy = pts[1] # Focus
+                 p = math.hypot(fx - vx, fy - vy)
+                 if p < 1:
+                     messagebox.showwarning("Input Error", "Vertex and Focus cannot be the same point.")
+                     return
+                 angle = math.atan2(fy - vy, fx - vx)
+                 self.status_var.set(f"Drawing Parabola: V=({vx},{vy}), p={p:.0f}, angle={math.degrees(angle):.0f}")
+                 self._run_steps(drawer, draw_conic_midpoint(drawer, vx, vy, parabola_coefficients(p, angle), [(0, 0)]))
 
             else:
                 # This should not happen if point collection logic is correct
                 print(f"State error: Incorrect points ({len(pts)}) for mode {self.current_mode}")
                 self._cancel_clicks() # Reset state
 
-            # No need for finalize_drawing anymore
-            # drawer.finalize_drawing()
-
         except Exception as e:
             messagebox.showerror("Drawing Error", f"An error occurred during drawing:\n{e}")
             print(f"Error drawing {self.current_mode}: {e}") # Log detailed error
@@ -613,12 +856,65 @@ class GraphicsEditor(tk.Tk):
              # Do NOT reset mode or points here, handled by _on_canvas_click success
 
 
+    def _run_steps(self, drawer, steps):
+        """Animates the steps when the debug window is open, otherwise draws the whole curve at once."""
+        self.animator.finish() # Complete a curve that is still animating
+        if drawer.debug_active:
+            self.animator.start(self._flushing_steps(drawer, steps))
+        else:
+            for _ in steps:
+                pass
+            drawer.flush() # One upload for the whole curve
+
+    def _draw_offsets(self, xc, yc, offsets):
+        """Draws a shape from its cached pixel offsets: one translate and one buffer write."""
+        self.animator.finish()
+        xs, ys = offsets
+        self.pixel_buffer.put(xs + xc, ys + yc, (0, 0, 0))
+        self.pixel_buffer.flush()
+
+    def _draw_spans(self, xc, yc, spans):
+        """Fills a shape from its cached scanlines: one buffer row slice per scanline."""
+        self.animator.finish()
+        dy, half_width = spans
+        self.pixel_buffer.put_spans(dy + yc, xc - half_width, xc + half_width, (0, 0, 0))
+        self.pixel_buffer.flush()
+
+    @staticmethod
+    def _flushing_steps(drawer, steps):
+        """Shows each animated step on the main canvas as soon as it is plotted."""
+        for _ in steps:
+            drawer.flush()
+            yield
+        drawer.flush()
+
+    def _toggle_pause(self):
+        if self.animator.paused:
+            self.animator.resume()
+        else:
+            self.animator.pause()
+
+    def _on_delay_change(self, value):
+        self.animator.set_delay(float(value))
+
+    def _on_animation_change(self):
+        """Keeps the debug controls in sync with the animation state."""
+        if self.pause_button and self.pause_button.winfo_exists():
+            self.pause_button.config(text="Resume" if self.animator.paused else "Pause",
+                                     state=tk.NORMAL if self.animator.active else tk.DISABLED)
+        if self.animator.paused:
+            self.status_var.set("Animation paused.")
+
     def clear_canvas(self):
-        self.main_canvas.delete("all")
+        self.animator.cancel()
+        self.main_canvas.delete("click_marker")
+        self.pixel_buffer.clear()
+        self.pixel_buffer.flush()
         # Also clear markers if any were left
         self.click_points = []
-        if self.debug_canvas and self.debug_canvas.winfo_exists():
-            self.debug_canvas.delete("debug_step") # Clear steps but keep grid
+        if self.debug_view and self.debug_canvas.winfo_exists():
+            self.debug_view.clear_cells() # Clear steps but keep grid
+            self.debug_view.flush()
         self.status_var.set("Canvas cleared. Select a curve type.")
         # Keep current mode active or reset? Let's keep it active.
         if self.current_mode:
@@ -642,59 +938,83 @@ class GraphicsEditor(tk.Tk):
 
         self.debug_window = tk.Toplevel(self)
         self.debug_window.title("Debug View - Algorithm Steps")
-        self.debug_window.geometry(f"{DEBUG_GRID_SIZE + 40}x{DEBUG_GRID_SIZE + 60}") # Extra space for label
+        self.debug_window.geometry(f"{DEBUG_GRID_SIZE + 40}x{DEBUG_GRID_SIZE + 160}") # Extra space for label and controls
         # Make it non-modal
         self.debug_window.transient(self)
 
-        # Add label about GUI freeze
-        ttk.Label(self.debug_window, text="Note: GUI may freeze during step delays.", font=("Arial", 8)).pack(pady=(5,0))
+        # Steps are animated with after(), so the editor stays usable while a curve is drawn
+        ttk.Label(self.debug_window, text="Note: curves are drawn step by step; use the controls below.", font=("Arial", 8)).pack(pady=(5,0))
 
-        self.debug_canvas = tk.Canvas(self.debug_window, width=DEBUG_GRID_SIZE, height=DEBUG_GRID_SIZE, bg="lightgrey")
+        self.debug_canvas = tk.Canvas(self.debug_window, width=DEBUG_GRID_SIZE, height=DEBUG_GRID_SIZE,
+                                      bg="lightgrey", highlightthickness=0)
         self.debug_canvas.pack(padx=10, pady=10)
-
-        # Draw the grid immediately
-        self._draw_debug_grid()
+        # Сетка и отмеченные клетки - одно изображение; перетаскивание сдвигает вид, колесо масштабирует
+        self.debug_view = DebugView(self.debug_canvas, DEBUG_GRID_SIZE, DEBUG_GRID_SIZE, DEBUG_CELL_SIZE)
+        self.debug_view.flush()
+        self.debug_canvas.bind("<ButtonPress-1>", self._on_debug_press)
+        self.debug_canvas.bind("<B1-Motion>", self._on_debug_drag)
+        self.debug_canvas.bind("<MouseWheel>", self._on_debug_wheel) # Windows, macOS
+        self.debug_canvas.bind("<Button-4>", self._on_debug_wheel) # X11
+        self.debug_canvas.bind("<Button-5>", self._on_debug_wheel)
+
+        view_controls = ttk.Frame(self.debug_window)
+        view_controls.pack(fill=tk.X, padx=10)
+        ttk.Button(view_controls, text="Fit", command=self._fit_debug_view).pack(side=tk.LEFT)
+        ttk.Button(view_controls, text="Reset View", command=self._reset_debug_view).pack(side=tk.LEFT, padx=2)
+        ttk.Label(view_controls, text="Drag to pan, wheel to zoom", font=("Arial", 8)).pack(side=tk.LEFT, padx=5)
+
+        # Animation controls: pause/resume, cancel and delay between steps
+        controls = ttk.Frame(self.debug_window)
+        controls.pack(fill=tk.X, padx=10)
+        self.pause_button = ttk.Button(controls, text="Pause", command=self._toggle_pause)
+        self.pause_button.pack(side=tk.LEFT)
+        ttk.Button(controls, text="Cancel", command=self.animator.cancel).pack(side=tk.LEFT, padx=2)
+        tk.Scale(controls, from_=0, to=MAX_DEBUG_DELAY_MS, orient=tk.HORIZONTAL, label="Delay, ms",
+                 variable=self.step_delay_var, command=self._on_delay_change).pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self._on_animation_change()
 
         # Handle closing the debug window via 'X' button
         self.debug_window.protocol("WM_DELETE_WINDOW", self._on_debug_close)
 
     def _on_debug_close(self):
          # Called when debug window 'X' is clicked or toggled off
+         self.animator.finish() # Without the debug view there is nothing to animate
          if self.debug_window and self.debug_window.winfo_exists():
              self.debug_window.destroy()
          # Crucially, reset the references
          self.debug_window = None
          self.debug_canvas = None
+         self.debug_view = None
+         self.pause_button = None
          self.status_var.set("Debug window closed.")
 
 
-    def _draw_debug_grid(self):
-        if not self.debug_canvas: return
-        self.debug_canvas.delete("grid_line") # Clear only grid lines
+    def _on_debug_press(self, event):
+        self.pan_anchor = (event.x, event.y)
 
-        center_x, center_y = self.debug_origin_offset
-        step = DEBUG_CELL_SIZE
+    def _on_debug_drag(self, event):
+        if self.pan_anchor is None:
+            return
+        self.debug_view.pan(event.x - self.pan_anchor[0], event.y - self.pan_anchor[1])
+        self.debug_view.flush()
+        self.pan_anchor = (event.x, event.y)
 
-        # Draw grid lines
-        for i in range(step, DEBUG_GRID_SIZE // 2 + step, step):
-             # Positive X lines
-            self.debug_canvas.create_line(center_x + i, 0, center_x + i, DEBUG_GRID_SIZE, fill="grey", tags="grid_line", dash=(1, 3))
-            # Negative X lines
-            self.debug_canvas.create_line(center_x - i, 0, center_x - i, DEBUG_GRID_SIZE, fill="grey", tags="grid_line", dash=(1, 3))
-            # Positive Y lines (Canvas Y is down)
-            self.debug_canvas.create_line(0, center_y - i, DEBUG_GRID_SIZE, center_y - i, fill="grey", tags="grid_line", dash=(1, 3))
-            # Negative Y lines
-            self.debug_canvas.create_line(0, center_y + i, DEBUG_GRID_SIZE, center_y + i, fill="grey", tags="grid_line", dash=(1, 3))
+    def _on_debug_wheel(self, event):
+        zoom_in = event.num == 4 or event.delta > 0
+        self.debug_view.zoom(1 if zoom_in else -1, event.x, event.y)
+        self.debug_view.flush()
 
-        # Draw thicker axis lines
-        self.debug_canvas.create_line(center_x, 0, center_x, DEBUG_GRID_SIZE, fill="black", width=1, tags="grid_line") # Y-axis
-        self.debug_canvas.create_line(0, center_y, DEBUG_GRID_SIZE, center_y, fill="black", width=1, tags="grid_line") # X-axis
+    def _fit_debug_view(self):
+        self.debug_view.fit()
+        self.debug_view.flush()
 
-        # Add origin label
-        self.debug_canvas.create_text(center_x + 2, center_y - 2, text="(0,0)", anchor=tk.NW, font=("Arial", 7, "italic"), fill="black", tags="grid_line")
+    def _reset_debug_view(self):
+        self.debug_view.reset_view()
+        self.debug_view.flush()
 
 
     def _on_closing(self):
+        self.animator.cancel()
         if self.debug_window and self.debug_window.winfo_exists():
             self.debug_window.destroy()
         self.destroy() # Close the main window
@@ -0,0 +1,247 @@
+"""
+Pixel buffer for the curve editor.
+
+Pixels live in a NumPy array of shape (height, width, 3) and are shown on the
+canvas through a single PhotoImage, so the number of canvas items does not
+depend on how many curves (or how large ones) have been drawn.
+"""
+import math
+import tkinter as tk
+from array import array
+
+import numpy as np
+
+BACKGROUND = (255, 255, 255)
+
+# Debug grid colors
+GRID_BACKGROUND = (211, 211, 211) # lightgrey
+GRID_LINE = (160, 160, 160)
+GRID_AXIS = (0, 0, 0)
+CELL_COLOR = (255, 0, 0)
+MIN_GRID_LINE_CELL = 4 # Grid lines are baked in only when cells are at least this large
+ZOOM_LEVELS = (0.25, 0.5, 1, 2, 3, 4, 6, 8, 10, 12, 16, 20, 24, 32, 40, 48, 64) # Cell sizes in pixels
+
+
+def ppm_bytes(pixels):
+    """Encodes an RGB array as binary PPM (P6)."""
+    height, width = pixels.shape[:2]
+    header = b"P6 %d %d 255 " % (width, height)
+    return header + np.ascontiguousarray(pixels, dtype=np.uint8).tobytes()
+
+
+def upload(image, pixels, x=0, y=0):
+    """Writes an RGB array into a PhotoImage with one call, starting at (x, y)."""
+    image.tk.call(image.name, "put", ppm_bytes(pixels), "-format", "ppm", "-to", x, y)
+
+
+class PixelBuffer:
+    """RGB buffer shown on a canvas through one PhotoImage."""
+    def __init__(self, canvas, width, height, background=BACKGROUND):
+        self.canvas = canvas
+        self.width = width
+        self.height = height
+        self.background = background
+        self.pixels = np.empty((height, width, 3), dtype=np.uint8)
+        self.pixels[:] = background
+
+        self.image = tk.PhotoImage(master=canvas, width=width, height=height)
+        self.item = canvas.create_image(0, 0, image=self.image, anchor=tk.NW)
+        self.dirty_rect = (0, 0, width, height) # Changed area (x0, y0, x1, y1) or None
+
+    def mark_dirty(self, x0=0, y0=0, x1=None, y1=None):
+        """Adds the rectangle [x0, x1) x [y0, y1) to the area uploaded by the next flush."""
+        x1 = self.width if x1 is None else x1
+        y1 = self.height if y1 is None else y1
+        x0, y0 = max(int(x0), 0), max(int(y0), 0)
+        x1, y1 = min(int(x1), self.width), min(int(y1), self.height)
+        if x0 >= x1 or y0 >= y1:
+            return
+        if self.dirty_rect is not None:
+            dx0, dy0, dx1, dy1 = self.dirty_rect
+            x0, y0, x1, y1 = min(x0, dx0), min(y0, dy0), max(x1, dx1), max(y1, dy1)
+        self.dirty_rect = (x0, y0, x1, y1)
+
+    def put(self, xs, ys, color):
+        """Sets the pixels (xs[i], ys[i]) to an RGB color; points outside the buffer are skipped."""
+        xs = np.asarray(xs, dtype=np.int64)
+        ys = np.asarray(ys, dtype=np.int64)
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        if not inside.any():
+            return
+        xs, ys = xs[inside], ys[inside]
+        self.pixels[ys, xs] = color
+        self.mark_dirty(xs.min(), ys.min(), xs.max() + 1, ys.max() + 1)
+
+    def put_intensities(self, xs, ys, intensities, color):
+        """
+        Paints the pixels (xs[i], ys[i]) with an RGB color at coverage intensities[i]
+        (0..1, mixed with the background). Where shades overlap the darker one stays,
+        so anti-aliased edges never lighten what is already drawn.
+        """
+        xs = np.asarray(xs, dtype=np.int64)
+        ys = np.asarray(ys, dtype=np.int64)
+        intensities = np.broadcast_to(np.asarray(intensities, dtype=np.float64), xs.shape)
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        if not inside.any():
+            return
+        xs, ys = xs[inside], ys[inside]
+        background = np.asarray(self.background, dtype=np.float64)
+        shades = background + intensities[inside, None] * (np.asarray(color, dtype=np.float64) - background)
+        np.minimum.at(self.pixels, (ys, xs), np.rint(shades).astype(np.uint8))
+        self.mark_dirty(xs.min(), ys.min(), xs.max() + 1, ys.max() + 1)
+
+    def put_spans(self, ys, x0s, x1s, color):
+        """Fills the horizontal spans x0s[i]..x1s[i] (inclusive) on rows ys[i], one row slice per span; clipped to the buffer."""
+        ys = np.asarray(ys, dtype=np.int64)
+        x0s = np.maximum(np.asarray(x0s, dtype=np.int64), 0)
+        x1s = np.minimum(np.asarray(x1s, dtype=np.int64), self.width - 1)
+        inside = (ys >= 0) & (ys < self.height) & (x0s <= x1s)
+        if not inside.any():
+            return
+        ys, x0s, x1s = ys[inside], x0s[inside], x1s[inside]
+        # Готовая строка цвета: копирование среза быстрее, чем растяжение RGB на каждую строку
+        line = np.empty((self.width, 3), dtype=np.uint8)
+        line[:] = color
+        pixels = self.pixels
+        for y, x0, x1 in zip(ys.tolist(), x0s.tolist(), x1s.tolist()):
+            pixels[y, x0:x1 + 1] = line[:x1 + 1 - x0]
+        self.mark_dirty(x0s.min(), ys.min(), x1s.max() + 1, ys.max() + 1)
+
+    def clear(self):
+        """Fills the buffer with the background color."""
+        self.pixels[:] = self.background
+        self.mark_dirty()
+
+    def flush(self):
+        """Uploads only the changed rectangle to the PhotoImage."""
+        if self.dirty_rect is None:
+            return
+        x0, y0, x1, y1 = self.dirty_rect
+        upload(self.image, self.pixels[y0:y1, x0:x1], x0, y0)
+        self.dirty_rect = None
+
+
+class DebugView(PixelBuffer):
+    """
+    Zoomed view of the algorithm's pixel grid. Highlighted cells are painted into
+    one image with the grid lines baked in; the view can be panned and zoomed over
+    the whole curve. Grid y points up, as on the original debug canvas.
+    """
+    def __init__(self, canvas, width, height, cell=10):
+        super().__init__(canvas, width, height, GRID_BACKGROUND)
+        self.default_cell = cell
+        self.cells_x = array("i") # Highlighted cells (grid coordinates)
+        self.cells_y = array("i")
+        self.reset_view()
+
+    def reset_view(self):
+        """Shows cell (0, 0) in the centre at the default zoom."""
+        self.cell = self.default_cell
+        self.origin_x = self.width // 2 # Pixel at the centre of cell (0, 0)
+        self.origin_y = self.height // 2
+        self.render()
+
+    def clear_cells(self):
+        self.cells_x = array("i")
+        self.cells_y = array("i")
+        self.render()
+
+    def add_cells(self, xs, ys):
+        """Highlights cells (xs[i], ys[i]), repainting only the area they cover."""
+        self.cells_x.extend(xs)
+        self.cells_y.extend(ys)
+        xs = np.asarray(xs, dtype=np.int64)
+        ys = np.asarray(ys, dtype=np.int64)
+        if not len(xs):
+            return
+        half = self.cell // 2
+        left = math.floor(self.origin_x + xs.min() * self.cell - half)
+        top = math.floor(self.origin_y - ys.max() * self.cell - half)
+        right = math.ceil(self.origin_x + xs.max() * self.cell - half + self.cell)
+        bottom = math.ceil(self.origin_y - ys.min() * self.cell - half + self.cell)
+        self.render(max(left, 0), max(top, 0), min(right, self.width), min(bottom, self.height))
+
+    def pan(self, dx, dy):
+        """Moves the view by (dx, dy) screen pixels."""
+        self.origin_x += dx
+        self.origin_y += dy
+        self.render()
+
+    def zoom(self, steps, x, y):
+        """Changes the cell size by `steps` zoom levels, keeping the grid point under (x, y) in place."""
+        level = min(range(len(ZOOM_LEVELS)), key=lambda i: abs(ZOOM_LEVELS[i] - self.cell))
+        cell = ZOOM_LEVELS[min(max(level + steps, 0), len(ZOOM_LEVELS) - 1)]
+        if cell == self.cell:
+            return
+        self.origin_x = round(x - (x - self.origin_x) * cell / self.cell)
+        self.origin_y = round(y - (y - self.origin_y) * cell / self.cell)
+        self.cell = cell
+        self.render()
+
+    def fit(self):
+        """Zooms and pans so that all highlighted cells are visible."""
+        if not self.cells_x:
+            self.reset_view()
+            return
+        xs, ys = self._cells()
+        span = max(int(xs.max()) - int(xs.min()), int(ys.max()) - int(ys.min())) + 1
+        fitting = [cell for cell in ZOOM_LEVELS if span * cell <= min(self.width, self.height)]
+        self.cell = fitting[-1] if fitting else ZOOM_LEVELS[0]
+        self.origin_x = round(self.width / 2 - (int(xs.min()) + int(xs.max())) / 2 * self.cell)
+        self.origin_y = round(self.height / 2 + (int(ys.min()) + int(ys.max())) / 2 * self.cell)
+        self.render()
+
+    def render(self, x0=0, y0=0, x1=None, y1=None):
+        """Repaints the rectangle [x0, x1) x [y0, y1) of the view from the highlighted cells."""
+        x1 = self.width if x1 is None else x1
+        y1 = self.height if y1 is None else y1
+        if x0 >= x1 or y0 >= y1:
+            return
+        region = self.pixels[y0:y1, x0:x1]
+        region[:] = GRID_BACKGROUND
+        if self.cell < 1:
+            self._render_cells_below_pixel(region, x0, y0)
+        else:
+            self._render_cells(region, x0, y0)
+        if x0 <= self.origin_x < x1:
+            region[:, self.origin_x - x0] = GRID_AXIS
+        if y0 <= self.origin_y < y1:
+            region[self.origin_y - y0, :] = GRID_AXIS
+        self.mark_dirty(x0, y0, x1, y1)
+
+    def _cells(self):
+        return np.frombuffer(self.cells_x, dtype=np.int32), np.frombuffer(self.cells_y, dtype=np.int32)
+
+    def _render_cells(self, region, x0, y0):
+        """Cells of one pixel or more: every pixel looks up the cell it belongs to."""
+        height, width = region.shape[:2]
+        cell, half = self.cell, self.cell // 2
+        # Клетка сетки для каждого столбца и строки пикселей
+        col_offset = np.arange(x0, x0 + width) - self.origin_x + half
+        row_offset = np.arange(y0, y0 + height) - self.origin_y + half
+        col_cell = col_offset // cell
+        row_cell = -(row_offset // cell)
+
+        # Отмеченные клетки в видимом диапазоне -> маска пикселей
+        gx0, gx1 = col_cell[0], col_cell[-1]
+        gy0, gy1 = row_cell[-1], row_cell[0]
+        marked = np.zeros((gy1 - gy0 + 1, gx1 - gx0 + 1), dtype=bool)
+        if self.cells_x:
+            xs, ys = self._cells()
+            visible = (xs >= gx0) & (xs <= gx1) & (ys >= gy0) & (ys <= gy1)
+            marked[ys[visible] - gy0, xs[visible] - gx0] = True
+        region[marked[np.ix_(row_cell - gy0, col_cell - gx0)]] = CELL_COLOR
+        if cell >= MIN_GRID_LINE_CELL:
+            region[:, col_offset % cell == 0] = GRID_LINE
+            region[row_offset % cell == 0, :] = GRID_LINE
+
+    def _render_cells_below_pixel(self, region, x0, y0):
+        """Cells smaller than a pixel: a pixel is highlighted if any of its cells is."""
+        if not self.cells_x:
+            return
+        height, width = region.shape[:2]
+        xs, ys = self._cells()
+        px = np.floor(self.origin_x + xs * self.cell).astype(np.int64) - x0
+        py = np.floor(self.origin_y - ys * self.cell).astype(np.int64) - y0
+        visible = (px >= 0) & (px < width) & (py >= 0) & (py < height)
+        region[py[visible], px[visible]] = CELL_COLOR
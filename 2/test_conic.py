@@ -0,0 +1,61 @@
+"""Regression tests for the conic tracer: python -m unittest test_conic (from this folder)."""
+import math
+import unittest
+
+from conic import ellipse_coefficients, parabola_coefficients, trace_conic
+
+
+def _vertex(a, angle):
+    return round(a * math.cos(angle)), round(a * math.sin(angle))
+
+
+class ThinEllipseTest(unittest.TestCase):
+    def _trace(self, a, b, angle):
+        start = _vertex(a, angle)
+        max_steps = round(8 * (a + b)) + 16 # Тот же предел, что в редакторе
+        pixels = list(trace_conic(ellipse_coefficients(a, b, angle), start, 1, closed=True, max_steps=max_steps))
+        return start, pixels, max_steps
+
+    def test_walks_around_a_thin_rotated_ellipse(self):
+        start, pixels, max_steps = self._trace(216.3, 1.5, math.radians(-70))
+        self.assertLess(len(pixels), max_steps) # Замкнулась сама, а не по пределу шагов
+        # Дошла до противоположной вершины и вернулась к началу
+        self.assertTrue(any(abs(x + start[0]) <= 1 and abs(y + start[1]) <= 1 for x, y in pixels))
+        # Замыкание у острого конца засчитывается за несколько пикселей до начала
+        self.assertLessEqual(max(abs(pixels[-1][0] - start[0]), abs(pixels[-1][1] - start[1])), 3)
+
+    def test_each_step_moves_to_a_neighbouring_pixel(self):
+        start, pixels, _ = self._trace(216.3, 1.5, math.radians(-70))
+        for (x0, y0), (x1, y1) in zip([start] + pixels, pixels):
+            self.assertEqual(max(abs(x1 - x0), abs(y1 - y0)), 1)
+
+    def test_stays_on_thin_and_degenerate_ellipses(self):
+        for a, b, degrees in ((216.3, 1.5, -70), (250.0, 1.0, 33), (120.0, 1.0, 0), (2.0, 180.0, -94)):
+            angle = math.radians(degrees)
+            start, pixels, max_steps = self._trace(a, b, angle)
+            self.assertLess(len(pixels), max_steps)
+            c, s = math.cos(angle), math.sin(angle)
+
+            def distance(x, y, u):
+                t, w = a * math.cos(u), b * math.sin(u)
+                return math.hypot(t * c - w * s - x, t * s + w * c - y)
+
+            for x, y in pixels:
+                # Ближайшая точка эллипса: грубо по 720 значениям параметра, затем уточнение рядом
+                u = min((k * math.pi / 360 for k in range(720)), key=lambda u: distance(x, y, u))
+                nearest = min(distance(x, y, u + k * math.pi / 36000) for k in range(-100, 101))
+                self.assertLess(nearest, 1)
+
+
+class OpenBranchTest(unittest.TestCase):
+    def test_stops_once_the_branch_leaves_the_bounds(self):
+        bounds = (-400, -300, 399, 299)
+        x_min, y_min, x_max, y_max = bounds
+        for direction in (1, -1):
+            pixels = list(trace_conic(parabola_coefficients(20, math.radians(30)), (0, 0), direction, bounds))
+            outside = [(x, y) for x, y in pixels if not (x_min <= x <= x_max and y_min <= y <= y_max)]
+            self.assertLessEqual(len(outside), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()